@@ -0,0 +1,208 @@
+"""Runs one question against a Cortex Agent from the command line.
+
+The answer's text is streamed to stdout as it arrives; status updates, tool
+calls and tables are summarized on stderr. For an agent object:
+
+    python -m agent_cli "How did revenue change last quarter?" --host HOST \\
+        --database DB --schema SCHEMA --agent AGENT
+
+Without `--agent`, `agentRun` is called with the fields of `--request`, as
+in `batch_runner`. The question is read from stdin when it is omitted or
+`-`, and the token from `--token` or `SNOWFLAKE_PAT`.
+
+`--events FILE` writes every event as a JSON line `{"event": ..., "data":
+...}` (`-` for stdout, which then replaces the text output) and `--timings`
+prints the run's `RunTimer` record to stderr at the end. The exit status is
+1 when the run ends with an `error` event or fails.
+
+Nothing here imports streamlit, pandas or numpy, so the runner starts in a
+fraction of the time of the demo and suits cron jobs and pipelines.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Optional, TextIO
+
+from agent_client import AgentClient
+from fast_events import StatusEventData, TextDeltaEventData, ThinkingDeltaEventData
+from resumable_stream import RESET_EVENT, ResumableStream
+from run_args import add_connection_args, build_request, load_request_fields
+from run_timing import RunTimer
+
+
+class CliRunner:
+    """Streams one run to text and/or JSON Lines outputs."""
+
+    def __init__(
+        self,
+        client: AgentClient,
+        database: Optional[str] = None,
+        schema: Optional[str] = None,
+        agent: Optional[str] = None,
+        request_fields: Optional[Dict[str, Any]] = None,
+        text: Optional[TextIO] = sys.stdout,
+        events: Optional[TextIO] = None,
+        log: Optional[TextIO] = sys.stderr,
+        thinking: bool = False,
+    ) -> None:
+        """
+        Args:
+            client: Client the run is sent with.
+            database, schema, agent: Agent object to run, `agentRun` if unset.
+            request_fields: Other run request fields, without `messages`.
+            text: Receives the answer's text deltas.
+            events: Receives every event as a JSON line.
+            log: Receives status updates, tool calls and table summaries.
+            thinking: Also stream thinking deltas to `log`.
+        """
+        self.client = client
+        self.database = database
+        self.schema = schema
+        self.agent = agent
+        self.request_fields = request_fields or {}
+        self.text = text
+        self.events = events
+        self.log = log
+        self.thinking = thinking
+
+    def build_request(self, question: str):
+        return build_request(question, self.request_fields, self.agent is not None)
+
+    def post(self, request):
+        if self.agent is not None:
+            return self.client.data_agent_run(self.database, self.schema, self.agent, request)
+        return self.client.agent_run(request)
+
+    def run(self, question: str, timer: Optional[RunTimer] = None) -> bool:
+        """Streams the run of `question`, returns whether it succeeded."""
+        request = self.build_request(question)
+        timer = timer or RunTimer()
+        response = self.post(request)
+        timer.headers(response.headers)
+        self._log(f"request_id: {response.headers.get('X-Snowflake-Request-Id')}")
+
+        def reconnect():
+            return self.post(request).iter_content(chunk_size=None)
+
+        ok = True
+        thinking = False
+        # Content index of the text item being written, to separate items
+        text_index = None
+        frames = ResumableStream(reconnect, response.iter_content(chunk_size=None))
+        for event, data in timer.wrap(frames):
+            if self.events is not None:
+                self.events.write(_json_line(event, data))
+            match event:
+                case "response.text.delta":
+                    delta = TextDeltaEventData.from_json(data)
+                    if text_index is not None and delta.content_index != text_index:
+                        self._write("\n\n")
+                    text_index = delta.content_index
+                    self._write(delta.text)
+                case "response.thinking.delta":
+                    if self.thinking and self.log is not None:
+                        self.log.write(ThinkingDeltaEventData.from_json(data).text)
+                        self.log.flush()
+                        thinking = True
+                case "response.thinking":
+                    if thinking:
+                        self.log.write("\n")
+                        thinking = False
+                case "response.status":
+                    self._log(f"[{StatusEventData.from_json(data).message}]")
+                case "response.tool_use":
+                    payload = json.loads(data)
+                    self._log(f"[tool {payload.get('name')} ({payload.get('type')})]")
+                case "response.table":
+                    table = json.loads(data)
+                    rows = ((table.get("result_set") or {}).get("resultSetMetaData") or {}).get("numRows")
+                    self._log(f"[table {table.get('title') or ''} {rows} rows]")
+                case _ if event == RESET_EVENT:
+                    # Text already written stays, the rerun starts over below it
+                    self._log("[stream interrupted, the rerun differs; restarting the answer]")
+                    if text_index is not None:
+                        self._write("\n\n")
+                    text_index = None
+                    if thinking:
+                        self.log.write("\n")
+                        thinking = False
+                case "error":
+                    ok = False
+                    payload = json.loads(data)
+                    self._log(f"Error: {payload.get('message')} (code: {payload.get('code')})")
+        if text_index is not None:
+            self._write("\n")
+        if self.events is not None:
+            self.events.flush()
+        return ok
+
+    def _write(self, text: str) -> None:
+        if self.text is not None:
+            self.text.write(text)
+            self.text.flush()
+
+    def _log(self, line: str) -> None:
+        if self.log is not None:
+            self.log.write(line + "\n")
+            self.log.flush()
+
+
+def _json_line(event: str, data: str) -> str:
+    try:
+        payload = json.loads(data)
+    except ValueError:
+        # Not every event has to carry JSON, keep those as a string
+        payload = data
+    return json.dumps({"event": event, "data": payload}) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a Cortex Agent from the command line")
+    parser.add_argument("question", nargs="?", default="-", help="question, `-` reads stdin")
+    add_connection_args(parser)
+    parser.add_argument("--events", help="write events as JSON Lines to this file, `-` for stdout")
+    parser.add_argument("--timings", action="store_true", help="print the run's timings to stderr")
+    parser.add_argument("--thinking", action="store_true", help="stream thinking to stderr")
+    parser.add_argument("-q", "--quiet", action="store_true", help="no status output on stderr")
+    args = parser.parse_args()
+
+    request_fields = load_request_fields(parser, args)
+    question = sys.stdin.read().strip() if args.question == "-" else args.question
+    if not question:
+        parser.error("empty question")
+
+    events = None
+    if args.events == "-":
+        events = sys.stdout
+    elif args.events:
+        events = open(args.events, "w", encoding="utf-8")
+    client = AgentClient(args.host, args.token, verify=not args.insecure, scheme=args.scheme)
+    runner = CliRunner(
+        client,
+        database=args.database,
+        schema=args.schema,
+        agent=args.agent,
+        request_fields=request_fields,
+        text=None if events is sys.stdout else sys.stdout,
+        events=events,
+        log=None if args.quiet else sys.stderr,
+        thinking=args.thinking,
+    )
+    timer = RunTimer(registry=None)
+    try:
+        ok = runner.run(question, timer)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        ok = False
+    finally:
+        client.close()
+        if events is not None and events is not sys.stdout:
+            events.close()
+    if args.timings:
+        print(json.dumps(timer.finish()), file=sys.stderr)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import io
+import time
+from typing import Callable, Hashable, Iterator, List, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import request_json
+from models import DataAgentRunRequest, LiteAgentRunRequest
+from rate_limiter import AdaptiveLimiter, RetryPolicy
+from request_compression import DEFAULT_THRESHOLD, ENCODINGS, encode_body
+from response_cache import ResponseCache
+
+
+class AgentClient:
+    """Cortex Agent REST client sharing one keep-alive connection pool.
+
+    A single instance is meant to be reused for every run in the process, so
+    each chat turn reuses an open TCP/TLS connection to the Snowflake host
+    instead of paying a fresh handshake.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        pool_connections: int = 4,
+        pool_maxsize: int = 32,
+        timeout: Tuple[float, float] = (10.0, 300.0),
+        verify: Union[bool, str] = True,
+        scheme: str = "https",
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        max_retries: int = 2,
+        compression: Optional[str] = None,
+        compression_threshold: int = DEFAULT_THRESHOLD,
+    ) -> None:
+        """
+        Args:
+            host: Snowflake account host, e.g. `orgname-accountname.snowflakecomputing.com`.
+            token: PAT or other bearer token.
+            pool_connections: Number of per-host pools to cache.
+            pool_maxsize: Maximum connections kept open per host, i.e. the
+                number of runs that can stream concurrently without opening
+                throwaway connections.
+            timeout: (connect, read) timeouts in seconds. The read timeout
+                bounds the gap between two streamed chunks, not the whole run.
+            verify: Passed through to `requests` for TLS verification.
+            scheme: `http` only makes sense against a local mock server.
+            cache: Replays identical non-threaded runs from this cache.
+            limiter: Admits runs, shared with every other client using it. A
+                run holds its permit until the response is read to the end
+                or closed; see `RetryPolicy`.
+            max_retries: Retries of a run rejected with 429, 503 or 504,
+                after `Retry-After` or a jittered backoff.
+            compression: `gzip` or `zstd` to compress request bodies of at
+                least `compression_threshold` bytes. The endpoint must accept
+                the `Content-Encoding`.
+        """
+        if compression is not None and compression not in ENCODINGS:
+            raise ValueError(f"compression must be one of {ENCODINGS}, got {compression!r}")
+        self.host = host
+        self.scheme = scheme
+        self.cache = cache
+        self.retry = RetryPolicy(limiter, max_retries)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = verify
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+                "Accept": "text/event-stream",
+                "Connection": "keep-alive",
+            }
+        )
+
+    def data_agent_run(
+        self,
+        database: str,
+        schema: str,
+        agent: str,
+        request: DataAgentRunRequest,
+        session: Hashable = None,
+    ) -> requests.Response:
+        """Calls `dataAgentRun` and returns the streaming response.
+
+        `session` identifies the user session for fair queueing in the limiter.
+        """
+        return self._run(
+            f"/api/v2/databases/{database}/schemas/{schema}/agents/{agent}:run",
+            request,
+            session,
+        )
+
+    def agent_run(
+        self, request: LiteAgentRunRequest, session: Hashable = None
+    ) -> requests.Response:
+        """Calls `agentRun` and returns the streaming response."""
+        return self._run("/api/v2/cortex/agent:run", request, session)
+
+    def create_thread(self, origin_application: str = "") -> int:
+        """Creates a conversation thread and returns its id.
+
+        Threads are served by the Cortex Threads API, next to the :run
+        endpoints; the response is the new thread id, either bare or as
+        `{"thread_id": ...}`.
+        """
+        resp = self.session.post(
+            url=f"{self.scheme}://{self.host}/api/v2/cortex/threads",
+            json={"origin_application": origin_application},
+            headers={"Accept": "application/json"},
+            timeout=self.timeout,
+        )
+        if resp.status_code >= 400:
+            raise Exception(f"Failed request with status {resp.status_code}: {resp.text}")
+        body = resp.json()
+        return int(body["thread_id"] if isinstance(body, dict) else body)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _run(
+        self,
+        path: str,
+        request: Union[DataAgentRunRequest, LiteAgentRunRequest],
+        session: Hashable = None,
+    ) -> requests.Response:
+        if self.cache is None or not self.cache.cacheable(request):
+            return self._post(path, request_json.dumps(request), session)
+        key = self.cache.key(path, request)
+        body = self.cache.get(key)
+        if body is not None:
+            return _replay(f"{self.scheme}://{self.host}{path}", body)
+        resp = self._post(path, request_json.dumps(request), session)
+        resp.raw = _RecordingStream(resp.raw, self.cache, key)
+        return resp
+
+    def _post(self, path: str, body: bytes, session: Hashable = None) -> requests.Response:
+        body, headers = encode_body(body, self.compression, self.compression_threshold)
+        retry = self.retry
+        for attempt in retry.attempts():
+            permit = retry.acquire(session)
+            try:
+                resp = self.session.post(
+                    url=f"{self.scheme}://{self.host}{path}",
+                    data=body,
+                    headers=headers,
+                    stream=True,
+                    timeout=self.timeout,
+                )
+            except Exception:
+                retry.release(permit)
+                raise
+            status = resp.status_code
+            if status < 400:
+                if permit is not None:
+                    resp.raw = _ReleasingStream(
+                        resp.raw, lambda ok: retry.release(permit, status if ok else None)
+                    )
+                return resp
+            message = f"Failed request with status {status}: {resp.text}"
+            # Hand the connection back to the pool before raising
+            resp.close()
+            delay = retry.rejected(permit, status, resp.headers, attempt)
+            if delay is None:
+                raise Exception(message)
+            time.sleep(delay)
+
+
+def _replay(url: str, body: bytes) -> requests.Response:
+    """A finished streaming response serving a cached run."""
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = url
+    resp.encoding = "utf-8"
+    resp.headers["Content-Type"] = "text/event-stream"
+    resp.headers["X-Cache"] = "HIT"
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+class _RecordingStream:
+    """Wraps a urllib3 response and caches the run once it was fully read."""
+
+    def __init__(self, raw, cache: ResponseCache, key: str) -> None:
+        self._raw = raw
+        self._cache = cache
+        self._key = key
+
+    def stream(self, *args, **kwargs) -> Iterator[bytes]:
+        chunks: List[bytes] = []
+        for chunk in self._raw.stream(*args, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self._cache.put_stream(self._key, chunks)
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
+
+
+class _ReleasingStream:
+    """Wraps a urllib3 response and calls `release` once it was read or closed.
+
+    `release(True)` means the stream was read to the end; a read that
+    failed or a response closed early calls `release(False)`. Only the
+    first call counts.
+    """
+
+    def __init__(self, raw, release: Callable[[bool], None]) -> None:
+        self._raw = raw
+        self._release = release
+
+    def stream(self, *args, **kwargs) -> Iterator[bytes]:
+        try:
+            yield from self._raw.stream(*args, **kwargs)
+            self._release(True)
+        finally:
+            self._release(False)
+
+    def close(self) -> None:
+        self._raw.close()
+        self._release(False)
+
+    def __getattr__(self, name: str):
+        return getattr(self._raw, name)
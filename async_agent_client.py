@@ -0,0 +1,204 @@
+import asyncio
+import ssl
+from typing import AsyncIterator, Callable, Hashable, List, Mapping, Optional, Union
+
+import aiohttp
+
+import request_json
+from models import DataAgentRunRequest, LiteAgentRunRequest, ServerSentEvent
+from models.server_sent_event import SERVERSENTEVENT_DISCRIMINATOR_MAP
+from rate_limiter import AdaptiveLimiter, RetryPolicy
+from request_compression import DEFAULT_THRESHOLD, ENCODINGS, encode_body
+from response_cache import ResponseCache
+from sse_decoder import SSEFrame, aiter_sse, iter_sse
+
+
+class AsyncAgentClient:
+    """asyncio Cortex Agent REST client.
+
+    Each run is an async iterator of typed `ServerSentEvent`s, so one event
+    loop can drive hundreds of concurrent runs without a thread per stream.
+
+    Backpressure comes from the iterator itself: the socket is only read when
+    the consumer asks for the next event, and aiohttp stops reading from the
+    transport once its buffer is full. Cancelling the consuming task (or
+    calling `aclose()` on the iterator) closes the response and releases the
+    connection.
+
+    Use as an async context manager, or call `close()` when done:
+
+        async with AsyncAgentClient(host, token) as client:
+            async for event in client.data_agent_run(db, schema, agent, request):
+                ...
+    """
+
+    def __init__(
+        self,
+        host: str,
+        token: str,
+        limit: int = 100,
+        timeout: Optional[aiohttp.ClientTimeout] = None,
+        verify: Union[bool, ssl.SSLContext] = True,
+        scheme: str = "https",
+        cache: Optional[ResponseCache] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        max_retries: int = 2,
+        compression: Optional[str] = None,
+        compression_threshold: int = DEFAULT_THRESHOLD,
+    ) -> None:
+        """
+        Arguments not listed here are as for `AgentClient`; a run holds its
+        limiter permit until its iterator is exhausted or closed.
+
+        Args:
+            limit: Maximum number of simultaneously open connections.
+            timeout: Defaults to a 10s connect timeout and a 300s limit on the
+                gap between two streamed chunks, with no limit on a whole run.
+            verify: `False` disables TLS verification, an `SSLContext` is used as is.
+        """
+        if compression is not None and compression not in ENCODINGS:
+            raise ValueError(f"compression must be one of {ENCODINGS}, got {compression!r}")
+        self.host = host
+        self.scheme = scheme
+        self.cache = cache
+        self.retry = RetryPolicy(limiter, max_retries)
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.limit = limit
+        self.timeout = timeout or aiohttp.ClientTimeout(
+            total=None, sock_connect=10, sock_read=300
+        )
+        self.ssl = None if verify is True else verify
+        self.headers = {
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncAgentClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        # Created lazily, aiohttp sessions must be bound to a running loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.limit, ssl=self.ssl),
+                timeout=self.timeout,
+                headers=self.headers,
+            )
+        return self._session
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def create_thread(self, origin_application: str = "") -> int:
+        """Creates a conversation thread and returns its id, see `AgentClient.create_thread`."""
+        async with self.session.post(
+            f"{self.scheme}://{self.host}/api/v2/cortex/threads",
+            json={"origin_application": origin_application},
+            headers={"Accept": "application/json"},
+        ) as resp:
+            if resp.status >= 400:
+                raise Exception(f"Failed request with status {resp.status}: {await resp.text()}")
+            body = await resp.json(content_type=None)
+        return int(body["thread_id"] if isinstance(body, dict) else body)
+
+    def data_agent_run(
+        self,
+        database: str,
+        schema: str,
+        agent: str,
+        request: DataAgentRunRequest,
+        session: Hashable = None,
+        raw: bool = False,
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+    ) -> AsyncIterator[Union[ServerSentEvent, SSEFrame]]:
+        """Calls `dataAgentRun` and yields the streamed events.
+
+        `session` identifies the user session for fair queueing in the limiter.
+        With `raw`, every `(event, data)` frame is yielded undecoded instead.
+        `on_headers` is called with the headers of the accepted response.
+        """
+        return self._stream(
+            f"/api/v2/databases/{database}/schemas/{schema}/agents/{agent}:run",
+            request,
+            session,
+            raw,
+            on_headers,
+        )
+
+    def agent_run(
+        self,
+        request: LiteAgentRunRequest,
+        session: Hashable = None,
+        raw: bool = False,
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+    ) -> AsyncIterator[Union[ServerSentEvent, SSEFrame]]:
+        """Calls `agentRun` and yields the streamed events, see `data_agent_run`."""
+        return self._stream("/api/v2/cortex/agent:run", request, session, raw, on_headers)
+
+    async def _stream(
+        self,
+        path: str,
+        request: Union[DataAgentRunRequest, LiteAgentRunRequest],
+        session: Hashable = None,
+        raw: bool = False,
+        on_headers: Optional[Callable[[Mapping[str, str]], None]] = None,
+    ) -> AsyncIterator[Union[ServerSentEvent, SSEFrame]]:
+        key = None
+        if self.cache is not None and self.cache.cacheable(request):
+            key = self.cache.key(path, request)
+            body = self.cache.get(key)
+            if body is not None:
+                if on_headers is not None:
+                    on_headers({"X-Cache": "HIT"})
+                for event, data in iter_sse([body]):
+                    if raw:
+                        yield event, data
+                    elif event in SERVERSENTEVENT_DISCRIMINATOR_MAP:
+                        yield ServerSentEvent.from_event(event, data)
+                return
+        frames: List[SSEFrame] = []
+        body, headers = encode_body(
+            request_json.dumps(request), self.compression, self.compression_threshold
+        )
+        retry = self.retry
+        for attempt in retry.attempts():
+            permit = await retry.acquire_async(session)
+            try:
+                async with self.session.post(
+                    f"{self.scheme}://{self.host}{path}", data=body, headers=headers
+                ) as resp:
+                    if resp.status >= 400:
+                        message = f"Failed request with status {resp.status}: {await resp.text()}"
+                        delay = retry.rejected(permit, resp.status, resp.headers, attempt)
+                        permit = None
+                        if delay is None:
+                            raise Exception(message)
+                    else:
+                        if on_headers is not None:
+                            on_headers(resp.headers)
+                        async for event, data in aiter_sse(resp.content.iter_any()):
+                            if key is not None:
+                                frames.append((event, data))
+                            if raw:
+                                yield event, data
+                            elif event in SERVERSENTEVENT_DISCRIMINATOR_MAP:
+                                yield ServerSentEvent.from_event(event, data)
+                        retry.release(permit, resp.status)
+                        permit = None
+                        break
+            finally:
+                # Still held if the request or its stream failed, or the
+                # consumer stopped early: neither counts as a success
+                retry.release(permit)
+            await asyncio.sleep(delay)
+        if key is not None:
+            self.cache.put(key, frames)
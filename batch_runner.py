@@ -0,0 +1,201 @@
+"""Runs a question set against an agent in parallel and records the results.
+
+Questions come from a text file (one per line, `#` comments allowed) or a
+JSON Lines file of objects with a `question` and an optional `id`. Every
+question is a fresh single-turn run; results are appended to a JSON Lines
+file as runs finish, one object per question:
+
+    {"index": 0, "id": ..., "question": ..., "status": "ok" | "error",
+     "error": ..., "message": <final Message>, "tool_calls": [...],
+     "sql": [...], "timings": {"first_event": s, "first_text": s, "total": s}}
+
+For an agent object:
+
+    python -m batch_runner questions.txt -o results.jsonl --host HOST \\
+        --database DB --schema SCHEMA --agent AGENT --concurrency 16 --rate 4
+
+Without `--agent`, `agentRun` is called with the fields of `--request`
+(a LiteAgentRunRequest JSON without `messages`). The token is read from
+`--token` or `SNOWFLAKE_PAT`.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional, TextIO
+
+from async_agent_client import AsyncAgentClient
+from rate_limiter import TokenBucket
+from run_args import add_connection_args, build_request, load_request_fields
+
+
+def load_questions(path: str) -> List[Dict[str, Any]]:
+    """Reads a question file into `{"id": ..., "question": ...}` dicts."""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            item = json.loads(line) if line.startswith("{") else {"question": line}
+            item.setdefault("id", len(questions))
+            questions.append(item)
+    return questions
+
+
+class BatchRunner:
+    """Fans questions out over one `AsyncAgentClient`.
+
+    At most `concurrency` runs stream at a time and, with a `rate`, runs
+    start no faster than `rate` per second.
+    """
+
+    def __init__(
+        self,
+        client: AsyncAgentClient,
+        database: Optional[str] = None,
+        schema: Optional[str] = None,
+        agent: Optional[str] = None,
+        request_fields: Optional[Dict[str, Any]] = None,
+        concurrency: int = 8,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+    ) -> None:
+        self.client = client
+        self.database = database
+        self.schema = schema
+        self.agent = agent
+        self.request_fields = request_fields or {}
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(rate, burst) if rate else None
+
+    def build_request(self, question: str):
+        return build_request(question, self.request_fields, self.agent is not None)
+
+    async def run(self, questions: List[Dict[str, Any]], out: TextIO) -> List[Dict[str, Any]]:
+        """Runs every question, writing each result to `out` as it finishes."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Dict[str, Any]] = []
+
+        async def worker(index: int, item: Dict[str, Any]) -> None:
+            async with semaphore:
+                if self.bucket is not None:
+                    await self.bucket.acquire_async()
+                result = await self.run_one(item["question"])
+            result = {"index": index, "id": item["id"], "question": item["question"], **result}
+            results.append(result)
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+
+        await asyncio.gather(*(worker(i, item) for i, item in enumerate(questions)))
+        results.sort(key=lambda result: result["index"])
+        return results
+
+    async def run_one(self, question: str) -> Dict[str, Any]:
+        request = self.build_request(question)
+        if self.agent is not None:
+            events = self.client.data_agent_run(self.database, self.schema, self.agent, request)
+        else:
+            events = self.client.agent_run(request)
+
+        tool_calls: Dict[str, Dict[str, Any]] = {}
+        sql: Dict[str, str] = {}
+        result: Dict[str, Any] = {"status": "ok", "error": None, "message": None}
+        timings: Dict[str, Optional[float]] = {"first_event": None, "first_text": None, "total": None}
+        clock = time.perf_counter
+        start = clock()
+        try:
+            async for sse in events:
+                event = sse.actual_instance
+                if timings["first_event"] is None:
+                    timings["first_event"] = clock() - start
+                match event.event:
+                    case "response.text.delta":
+                        if timings["first_text"] is None:
+                            timings["first_text"] = clock() - start
+                    case "response.tool_use":
+                        tool_calls[event.data.tool_use_id] = {
+                            "tool_use_id": event.data.tool_use_id,
+                            "type": event.data.type,
+                            "name": event.data.name,
+                            "input": event.data.input,
+                            "status": None,
+                        }
+                    case "response.tool_result.analyst.delta":
+                        if event.data.delta.sql:
+                            tool_use_id = event.data.tool_use_id
+                            sql[tool_use_id] = sql.get(tool_use_id, "") + event.data.delta.sql
+                    case "response.tool_result":
+                        if event.data.tool_use_id in tool_calls:
+                            tool_calls[event.data.tool_use_id]["status"] = event.data.status
+                    case "error":
+                        result["status"] = "error"
+                        result["error"] = event.data.to_dict()
+                    case "response":
+                        result["message"] = event.data.to_dict()
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = {"message": str(e)}
+        timings["total"] = clock() - start
+        result["tool_calls"] = list(tool_calls.values())
+        result["sql"] = [{"tool_use_id": key, "sql": value} for key, value in sql.items()]
+        result["timings"] = timings
+        return result
+
+
+def summarize(results: List[Dict[str, Any]], elapsed: float) -> str:
+    totals = sorted(r["timings"]["total"] for r in results)
+    errors = sum(1 for r in results if r["status"] != "ok")
+    if not totals:
+        return "no questions"
+    return (
+        f"{len(results)} runs in {elapsed:.1f}s, {errors} errors, "
+        f"p50 {totals[len(totals) // 2]:.2f}s, "
+        f"p95 {totals[min(len(totals) - 1, int(len(totals) * 0.95))]:.2f}s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a question set against a Cortex Agent")
+    parser.add_argument("questions", help="text or JSON Lines question file")
+    parser.add_argument("-o", "--output", default="results.jsonl")
+    add_connection_args(parser)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, help="maximum runs started per second")
+    parser.add_argument("--burst", type=float)
+    args = parser.parse_args()
+
+    request_fields = load_request_fields(parser, args)
+
+    questions = load_questions(args.questions)
+
+    async def run() -> List[Dict[str, Any]]:
+        async with AsyncAgentClient(
+            args.host,
+            args.token,
+            limit=args.concurrency,
+            verify=not args.insecure,
+            scheme=args.scheme,
+        ) as client:
+            runner = BatchRunner(
+                client,
+                database=args.database,
+                schema=args.schema,
+                agent=args.agent,
+                request_fields=request_fields,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                burst=args.burst,
+            )
+            with open(args.output, "w", encoding="utf-8") as out:
+                return await runner.run(questions, out)
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    print(summarize(results, time.perf_counter() - start), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Micro-benchmarks for the agent client pipeline.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_server_sent_event``.
+"""
@@ -0,0 +1,63 @@
+"""Decoding a `response` event with a large table, dict-native vs JSON round-trip.
+
+The oneOf wrappers used to implement `from_dict(obj)` as
+`cls.from_json(json.dumps(obj))`, re-serializing and re-parsing the nested
+content at every level. The `legacy` run patches that behaviour back in for
+comparison.
+"""
+
+import argparse
+import json
+import sys
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from mock_agent_server import synthetic_stream
+from models import Annotation, MessageContentItem, ResponseEvent, ServerSentEvent, ToolResultContent
+
+WRAPPERS = (Annotation, MessageContentItem, ServerSentEvent, ToolResultContent)
+
+
+@contextmanager
+def json_round_trip() -> Iterator[None]:
+    """Temporarily restores the previous `from_dict` of the oneOf wrappers."""
+    originals = {cls: cls.__dict__["from_dict"] for cls in WRAPPERS}
+    for cls in WRAPPERS:
+        registry = getattr(sys.modules[cls.__module__], f"{cls.__name__.upper()}_REGISTRY")
+        cls.from_dict = classmethod(
+            lambda cls, obj, registry=registry: registry.construct(cls, json.loads(json.dumps(obj)))
+        )
+    try:
+        yield
+    finally:
+        for cls, original in originals.items():
+            cls.from_dict = original
+
+
+def run(name: str, obj: dict, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ResponseEvent.from_dict(obj)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<12} {best * 1e3:>10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    event, data = synthetic_stream(table_rows=args.rows, table_columns=args.columns)[-1]
+    obj = {"event": event, "data": data}
+
+    run("dict-native", obj, args.repeat)
+    with json_round_trip():
+        run("legacy", obj, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Cold import time of the client modules, as `python -X importtime` reports it.
+
+Every target is imported in a fresh interpreter `--repeat` times and the
+best cumulative time of the target itself is kept, so the numbers include
+everything it pulls in (pydantic, requests, ...) but not interpreter start.
+The heaviest dependencies of each target are listed with `--top`. Pass
+`--json` to print one JSON object per target, e.g. to track the numbers in
+CI and compare them between commits.
+"""
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+TARGETS = [
+    "pydantic",
+    "models",
+    "models.server_sent_event",
+    "models.data_agent_run_request",
+    "fast_events",
+    "agent_client",
+    "async_agent_client",
+    "result_sets",
+]
+
+# "import time: self [us] | cumulative | imported package"
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def import_times(target: str) -> List[Tuple[str, int, int]]:
+    """(module, self µs, cumulative µs) of one cold import of `target`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match is not None:
+            times.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return times
+
+
+def measure(target: str, repeat: int) -> Tuple[int, Dict[str, int]]:
+    """Best cumulative µs of `target` and the self µs of each module it loaded."""
+    best = None
+    modules: Dict[str, int] = {}
+    for _ in range(repeat):
+        times = import_times(target)
+        total = next(cumulative for name, _, cumulative in times if name == target)
+        if best is None or total < best:
+            best = total
+            modules = {name: own for name, own, _ in times}
+    return best, modules
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="list the N slowest modules per target")
+    parser.add_argument("--json", action="store_true", help="print JSON lines")
+    args = parser.parse_args()
+
+    for target in args.targets:
+        total, modules = measure(target, args.repeat)
+        slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[: args.top]
+        if args.json:
+            print(json.dumps({
+                "target": target,
+                "cumulative_us": total,
+                "modules": len(modules),
+                "slowest": dict(slowest),
+            }))
+            continue
+        print(f"{target:<32} {total / 1e3:>8.1f} ms {len(modules):>5} modules")
+        for name, own in slowest:
+            print(f"    {name:<40} {own / 1e3:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
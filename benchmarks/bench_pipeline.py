@@ -0,0 +1,136 @@
+"""End-to-end benchmark of the client stream pipeline.
+
+Each stage of turning a `:run` response into rendered content is timed
+separately over canned corpora built with `mock_agent_server.synthetic_stream`:
+
+    sse_decode     raw bytes to (event, data) frames
+    dispatch       ServerSentEvent.from_event for every frame
+    event_data     the generated *EventData.from_json for every frame
+    event_data_fast  the same through fast_events where a fast class exists
+    accumulate     DeltaBuffer appends for text and thinking deltas
+    final_message  Message.from_json of the terminal `response` event
+    dataframe      to_dataframe of every `response.table` result set
+
+Every corpus runs in its own process so the reported peak RSS is its own.
+Pass `--json` to get machine-readable results for tracking regressions.
+"""
+
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from delta_buffer import DeltaBuffer
+from fast_events import EVENT_DATA_CLASSES
+from mock_agent_server import encode_frame, synthetic_stream
+from models import Message, ServerSentEvent, TableEventData
+from models.server_sent_event import SERVERSENTEVENT_DISCRIMINATOR_MAP
+from result_sets import to_dataframe
+from sse_decoder import SSEDecoder
+
+CORPORA: Dict[str, Dict[str, int]] = {
+    "small": dict(text_tokens=50, thinking_tokens=20, tool_calls=1, table_rows=10, table_columns=4),
+    "long_text": dict(text_tokens=20_000, thinking_tokens=5_000, tool_calls=1, table_rows=10, table_columns=4),
+    "wide_table": dict(text_tokens=200, thinking_tokens=50, tool_calls=1, table_rows=20_000, table_columns=40),
+    "many_tool_calls": dict(text_tokens=500, thinking_tokens=100, tool_calls=50, table_rows=100, table_columns=6),
+}
+
+# Event name to the generated model of its `data`
+EVENT_DATA_MODELS = {
+    event: cls.model_fields["data"].annotation
+    for event, cls in SERVERSENTEVENT_DISCRIMINATOR_MAP.items()
+    if "." in event or event in ("response", "error")
+}
+
+
+def timed(calls: Iterable[Callable[[], Any]]) -> Dict[str, float]:
+    """Runs each call, returning count, throughput and latency percentiles."""
+    latencies: List[float] = []
+    clock = time.perf_counter
+    for call in calls:
+        start = clock()
+        call()
+        latencies.append(clock() - start)
+    if not latencies:
+        return {"calls": 0, "per_sec": 0.0, "p50_us": 0.0, "p99_us": 0.0}
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "per_sec": len(latencies) / total if total else float("inf"),
+        "p50_us": latencies[len(latencies) // 2] * 1e6,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1e6,
+    }
+
+
+def run_corpus(name: str, chunk_size: int) -> Dict[str, Any]:
+    frames = synthetic_stream(**CORPORA[name])
+    body = b"".join(encode_frame(event, data) for event, data in frames)
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    decoder = SSEDecoder()
+    decoded = []
+    stages = {"sse_decode": timed(lambda c=c: decoded.extend(decoder.feed(c)) for c in chunks)}
+
+    stages["dispatch"] = timed(lambda e=e, d=d: ServerSentEvent.from_event(e, d) for e, d in decoded)
+    stages["event_data"] = timed(lambda e=e, d=d: EVENT_DATA_MODELS[e].from_json(d) for e, d in decoded)
+    stages["event_data_fast"] = timed(lambda e=e, d=d: EVENT_DATA_CLASSES[e].from_json(d) for e, d in decoded)
+
+    buffers: Dict[int, DeltaBuffer] = {}
+    deltas = [
+        json.loads(d)
+        for e, d in decoded
+        if e in ("response.text.delta", "response.thinking.delta")
+    ]
+    stages["accumulate"] = timed(
+        lambda d=d: buffers.setdefault(d["content_index"], DeltaBuffer()).append(d["text"])
+        for d in deltas
+    )
+
+    stages["final_message"] = timed(lambda d=d: Message.from_json(d) for e, d in decoded if e == "response")
+    tables = [TableEventData.from_json(d) for e, d in decoded if e == "response.table"]
+    stages["dataframe"] = timed(lambda t=t: to_dataframe(t.result_set) for t in tables)
+
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    return {"corpus": name, "events": len(decoded), "bytes": len(body), "peak_rss_mb": peak_mb, "stages": stages}
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"\n{result['corpus']}: {result['events']} events,"
+        f" {result['bytes'] / 2**20:.1f} MB, peak RSS {result['peak_rss_mb']:.0f} MB"
+    )
+    print(f"  {'stage':<16} {'calls':>8} {'calls/sec':>12} {'p50 us':>10} {'p99 us':>10}")
+    for stage, stats in result["stages"].items():
+        print(
+            f"  {stage:<16} {stats['calls']:>8} {stats['per_sec']:>12,.0f}"
+            f" {stats['p50_us']:>10.1f} {stats['p99_us']:>10.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", choices=sorted(CORPORA), action="append", help="default: all")
+    parser.add_argument("--chunk-size", type=int, default=8192)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    corpora = args.corpus or list(CORPORA)
+    # A fresh process per corpus keeps peak RSS figures independent
+    with multiprocessing.get_context("spawn").Pool(1, maxtasksperchild=1) as pool:
+        results = pool.starmap(run_corpus, [(name, args.chunk_size) for name in corpora], chunksize=1)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            print_report(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""CPU cost of compressing run request bodies against the upload time it saves.
+
+Bodies are built like `bench_request_json`: a history of turns whose
+assistant responses carry a table. For every encoding and level the
+compression time and ratio are measured; the upload time is modelled for a
+few link speeds, so the break-even point per link can be read off:
+
+    send = compress + size * 8 / bandwidth
+
+`zstd` levels are skipped unless the optional `zstandard` package is
+installed. Pass `--mock` to also POST every body to a local
+`MockAgentServer`, which checks that it decompresses to the same request.
+"""
+
+import argparse
+import time
+from typing import List, Optional, Tuple
+
+import request_json
+from benchmarks.bench_request_json import build_request
+from request_compression import compress
+
+# Link speeds in Mbit/s
+LINKS = (2, 10, 50, 500)
+
+SETTINGS: List[Tuple[str, Optional[int]]] = [
+    ("identity", None),
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 9),
+]
+
+
+def timed_compress(body: bytes, encoding: str, level: Optional[int], repeat: int) -> Tuple[bytes, float]:
+    if encoding == "identity":
+        return body, 0.0
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = compress(body, encoding, level)
+        best = min(best, time.perf_counter() - start)
+    return out, best
+
+
+def check_with_mock(body: bytes, encoding: str, expected: dict) -> None:
+    import requests
+
+    from mock_agent_server import MockAgentServer
+
+    server = MockAgentServer()
+    with server.serve_in_thread() as host:
+        headers = {"Content-Type": "application/json"}
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        requests.post(f"http://{host}/api/v2/cortex/agent:run", data=body, headers=headers).close()
+    assert server.requests[0] == expected, f"{encoding} body did not round-trip"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, nargs="+", default=[1, 5, 20])
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--mock", action="store_true", help="round-trip bodies through the mock server")
+    args = parser.parse_args()
+
+    header = f"{'encoding':<12} {'MB':>7} {'ratio':>6} {'cpu ms':>8}" + "".join(
+        f" {f'{link}Mb/s ms':>11}" for link in LINKS
+    )
+    for turns in args.turns:
+        request = build_request(turns, args.rows, args.columns)
+        body = request_json.dumps(request)
+        print(f"\n{turns} turns, {len(body) / 1e6:.2f} MB")
+        print(header)
+        for encoding, level in SETTINGS:
+            try:
+                out, cpu = timed_compress(body, encoding, level, args.repeat)
+            except ImportError:
+                continue
+            if args.mock:
+                check_with_mock(out, encoding, request.to_dict())
+            name = encoding if level is None else f"{encoding}-{level}"
+            sends = "".join(
+                f" {(cpu + len(out) * 8 / (link * 1e6)) * 1e3:>11.1f}" for link in LINKS
+            )
+            print(f"{name:<12} {len(out) / 1e6:>7.2f} {len(body) / len(out):>6.1f} {cpu * 1e3:>8.1f}{sends}")
+
+
+if __name__ == "__main__":
+    main()
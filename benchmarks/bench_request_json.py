@@ -0,0 +1,64 @@
+"""Serializing a long run request: generated `to_json` vs `request_json.dumps`.
+
+The history alternates short user questions with assistant responses that
+carry a table, as a conversation without threads sends on every turn.
+`dumps` is timed with the `orjson` fast path (when installed) and with the
+standard library encoder.
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+import request_json
+from mock_agent_server import synthetic_stream
+from models import DataAgentRunRequest, Message
+
+
+def build_request(turns: int, rows: int, columns: int) -> DataAgentRunRequest:
+    response = synthetic_stream(table_rows=rows, table_columns=columns)[-1][1]
+    messages = []
+    for turn in range(turns):
+        messages.append(
+            Message.from_dict({"role": "user", "content": [{"type": "text", "text": f"Question {turn}"}]})
+        )
+        messages.append(Message.from_dict(response))
+    messages.append(Message.from_dict({"role": "user", "content": [{"type": "text", "text": "Next"}]}))
+    return DataAgentRunRequest(messages=messages)
+
+
+def run(name: str, call: Callable[[], object], repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<16} {best * 1e3:>10.1f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    request = build_request(args.turns, args.rows, args.columns)
+    body = request_json.dumps(request)
+    assert json.loads(body) == request.to_dict()
+    print(f"{len(body) / 1e6:.1f} MB request body")
+
+    run("to_json", request.to_json, args.repeat)
+    if request_json.orjson is not None:
+        run("dumps (orjson)", lambda: request_json.dumps(request), args.repeat)
+    orjson, request_json.orjson = request_json.orjson, None
+    try:
+        run("dumps (json)", lambda: request_json.dumps(request), args.repeat)
+    finally:
+        request_json.orjson = orjson
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Events/sec for ServerSentEvent dispatch over a recorded text delta stream."""
+
+import argparse
+import json
+import time
+
+from models import ServerSentEvent, TextDeltaEvent
+
+
+def make_frames(count: int) -> list:
+    """Returns `count` `response.text.delta` envelopes as JSON strings."""
+    return [
+        json.dumps(
+            {
+                "event": "response.text.delta",
+                "data": {"content_index": i % 4, "text": f"token {i} "},
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def double_parse(frame: str):
+    """The previous dispatch: parse for the discriminator, then parse again
+    and assign through the validating `actual_instance` setter."""
+    instance = ServerSentEvent.model_construct()
+    if json.loads(frame).get("event") == "response.text.delta":
+        instance.actual_instance = TextDeltaEvent.from_json(frame)
+    return instance
+
+
+def run(name: str, fn, frames: list) -> None:
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {len(frames) / elapsed:>12,.0f} events/sec")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000)
+    args = parser.parse_args()
+
+    frames = make_frames(args.events)
+    payloads = [(json.loads(f)["event"], json.dumps(json.loads(f)["data"])) for f in frames]
+
+    run("double parse", double_parse, frames)
+    run("ServerSentEvent.from_json", ServerSentEvent.from_json, frames)
+    run(
+        "ServerSentEvent.from_event",
+        lambda p: ServerSentEvent.from_event(*p),
+        payloads,
+    )
+
+
+if __name__ == "__main__":
+    main()
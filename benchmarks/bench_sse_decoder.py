@@ -0,0 +1,76 @@
+"""SSEDecoder against sseclient on a multi-MB recorded-style stream.
+
+The client itself no longer depends on `sseclient`; the baseline needs the
+benchmark-only requirements:
+
+    pip install -r benchmarks/requirements.txt
+    python -m benchmarks.bench_sse_decoder
+
+Pass `--no-baseline` to time `SSEDecoder` alone.
+"""
+
+import argparse
+import json
+import time
+
+from sse_decoder import iter_sse
+
+
+def make_stream(events: int) -> bytes:
+    """Returns a `text/event-stream` body of text deltas and a final response."""
+    frames = []
+    text = []
+    for i in range(events):
+        token = f"token {i} "
+        text.append(token)
+        data = json.dumps({"content_index": 0, "text": token})
+        frames.append(f"event: response.text.delta\ndata: {data}\n\n")
+    response = json.dumps(
+        {"role": "assistant", "content": [{"type": "text", "text": "".join(text)}]}
+    )
+    frames.append(f"event: response\ndata: {response}\n\n")
+    return "".join(frames).encode("utf-8")
+
+
+def chunked(body: bytes, size: int) -> list:
+    return [body[i : i + size] for i in range(0, len(body), size)]
+
+
+def run(name: str, fn, chunks: list, size: int) -> None:
+    start = time.perf_counter()
+    count = sum(1 for _ in fn(chunks))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<12} {count / elapsed:>12,.0f} events/sec"
+        f" {size / elapsed / 2**20:>8.1f} MB/sec"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=8192)
+    parser.add_argument("--no-baseline", action="store_true", help="skip the sseclient baseline")
+    args = parser.parse_args()
+
+    sseclient = None
+    if not args.no_baseline:
+        try:
+            import sseclient
+        except ImportError:
+            parser.error(
+                "the sseclient baseline needs `pip install -r benchmarks/requirements.txt`"
+                " (or pass --no-baseline)"
+            )
+
+    body = make_stream(args.events)
+    chunks = chunked(body, args.chunk_size)
+    print(f"{len(body) / 2**20:.1f} MB in {len(chunks)} chunks of {args.chunk_size} bytes")
+
+    run("SSEDecoder", iter_sse, chunks, len(body))
+    if sseclient is not None:
+        run("sseclient", lambda c: sseclient.SSEClient(iter(c)).events(), chunks, len(body))
+
+
+if __name__ == "__main__":
+    main()
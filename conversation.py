@@ -0,0 +1,255 @@
+import json
+import os
+import tempfile
+import weakref
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+
+from lazy_message import LazyMessage
+from models import DataAgentRunRequest, LiteAgentRunRequest, Message
+
+RunRequest = TypeVar("RunRequest", DataAgentRunRequest, LiteAgentRunRequest)
+
+
+class Conversation:
+    """History of one chat and the server-side thread it is mirrored to.
+
+    With a `thread_id` the server already holds the earlier turns, so a run
+    only needs the new user message plus the id of the assistant message it
+    follows. Without one (threads unavailable), every run falls back to
+    sending the whole history.
+
+    With a `max_bytes` budget on `size` (the UTF-8 size of the history's
+    JSON), turns older than the last `keep_turns` are compacted once the
+    history outgrows it: thinking items are dropped and table result sets
+    (in `table` items and tool result JSON) are removed, keeping the tool
+    use and query ids as handles. With `spill_dir`, the
+    original message is first appended to a JSON Lines file there so it
+    can still be `restore`d. If compaction is not enough, the oldest turns
+    are evicted altogether.
+    """
+
+    def __init__(
+        self,
+        thread_id: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        keep_turns: int = 2,
+        spill_dir: Optional[str] = None,
+    ) -> None:
+        # History, kept for rendering and for the fallback
+        self.messages: List[Message] = []
+        # UTF-8 size of the JSON of each message in `messages`
+        self._sizes: List[int] = []
+        # Offset in the spill file of the original of each compacted message
+        self._spilled: List[Optional[int]] = []
+        self.max_bytes = max_bytes
+        self.keep_turns = keep_turns
+        self.spill_dir = spill_dir
+        self.spill_path: Optional[str] = None
+        # Number of leading messages that are already compacted
+        self._compacted = 0
+        self.thread_id = thread_id
+        # The first run in a new thread starts from message 0
+        self.parent_message_id: Optional[int] = 0 if thread_id is not None else None
+        # Index into `messages` of the first message the server hasn't seen
+        self._unsent = 0
+        # Whether the current run reported the id of its assistant message
+        self._seen_message_id = False
+
+    @property
+    def threaded(self) -> bool:
+        return self.thread_id is not None and self.parent_message_id is not None
+
+    @property
+    def size(self) -> int:
+        """UTF-8 size of the history's JSON in bytes.
+
+        This is what the history costs on the wire, and only a proxy for its
+        memory: the parsed content held next to a message's JSON (and
+        Python's per-object overhead) is not counted.
+        """
+        return sum(self._sizes)
+
+    def add_user_message(self, message: Message) -> None:
+        self._append(message)
+
+    def add_assistant_message(self, message: Message) -> None:
+        self._append(message)
+        if self.threaded and not self._seen_message_id:
+            # Without the new message id the next run can't continue the
+            # thread, so fall back to sending the full history from now on
+            self.thread_id = self.parent_message_id = None
+        self._seen_message_id = False
+        # The server recorded the whole turn as part of the run
+        self._unsent = len(self.messages)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            self.compact()
+
+    def discard_last_user_message(self) -> None:
+        """Drops the last user message so the turn can be retried."""
+        if self.messages and self.messages[-1].role == "user":
+            self.messages.pop()
+            self._sizes.pop()
+            self._spilled.pop()
+            self._unsent = min(self._unsent, len(self.messages))
+
+    def observe_metadata(self, data: Union[str, dict]) -> None:
+        """Records message ids from a `metadata` event of a threaded run.
+
+        The payload is `{"role": ..., "message_id": ...}`, optionally wrapped
+        in a `metadata` object. The next run continues from the assistant
+        message of this one.
+        """
+        if not isinstance(data, dict):
+            data = json.loads(data)
+        data = data.get("metadata", data)
+        if data.get("role") == "assistant" and data.get("message_id") is not None:
+            self.parent_message_id = int(data["message_id"])
+            self._seen_message_id = True
+
+    def build_request(
+        self, request_cls: Type[RunRequest] = DataAgentRunRequest, **kwargs: Any
+    ) -> RunRequest:
+        """Returns the run request for the pending user message(s).
+
+        Extra keyword arguments are passed through to `request_cls`.
+        """
+        if self.threaded:
+            return request_cls(
+                thread_id=self.thread_id,
+                parent_message_id=self.parent_message_id,
+                messages=self.messages[self._unsent :],
+                **kwargs,
+            )
+        return request_cls(messages=self.messages, **kwargs)
+
+    def compact(self) -> None:
+        """Compacts, then evicts, old turns until the history fits `max_bytes`.
+
+        The last `keep_turns` turns and messages not yet sent are never
+        touched. Without a budget, every older turn is compacted.
+        """
+        keep = self._keep_from()
+        for i in range(self._compacted, keep):
+            if self.max_bytes is not None and self.size <= self.max_bytes:
+                return
+            self._compact_message(i)
+            self._compacted = i + 1
+        if self.max_bytes is None:
+            return
+        # Evict whole turns so the history still starts with a user message
+        evict = 0
+        excess = self.size - self.max_bytes
+        while evict < keep and excess > 0:
+            excess -= self._sizes[evict]
+            evict += 1
+            while evict < keep and self.messages[evict].role != "user":
+                excess -= self._sizes[evict]
+                evict += 1
+        if evict:
+            del self.messages[:evict], self._sizes[:evict], self._spilled[:evict]
+            self._unsent -= evict
+            self._compacted = max(self._compacted - evict, 0)
+
+    def restore(self, index: int) -> Message:
+        """Returns `messages[index]` as it was before compaction.
+
+        Compacted messages can only be restored from the spill file; without
+        `spill_dir` the compacted message is returned.
+        """
+        offset = self._spilled[index]
+        if offset is None or self.spill_path is None:
+            return self.messages[index]
+        with open(self.spill_path, "rb") as f:
+            f.seek(offset)
+            return LazyMessage.from_json(f.readline().rstrip(b"\n"))
+
+    def close(self) -> None:
+        """Removes the spill file, if any."""
+        if self.spill_path is not None:
+            self._finalizer()
+            self.spill_path = None
+
+    def _append(self, message: Message) -> None:
+        self.messages.append(message)
+        self._sizes.append(_json_size(message))
+        self._spilled.append(None)
+
+    def _keep_from(self) -> int:
+        """Index of the first message that must be kept as is."""
+        keep = min(self._unsent, len(self.messages))
+        if self.keep_turns <= 0:
+            return keep
+        turns = 0
+        for i in range(keep - 1, -1, -1):
+            if self.messages[i].role == "user":
+                turns += 1
+                if turns == self.keep_turns:
+                    return i
+        return 0
+
+    def _compact_message(self, index: int) -> None:
+        message = self.messages[index]
+        original = message.to_json()
+        compacted = _compact_dict(json.loads(original))
+        if compacted is None:
+            return
+        if self.spill_dir is not None:
+            self._spilled[index] = self._spill(original)
+        message = LazyMessage.from_dict(compacted)
+        self.messages[index] = message
+        self._sizes[index] = _json_size(message)
+
+    def _spill(self, line: str) -> int:
+        if self.spill_path is None:
+            fd, self.spill_path = tempfile.mkstemp(
+                prefix="conversation-", suffix=".jsonl", dir=self.spill_dir
+            )
+            os.close(fd)
+            # Don't leak the file when a session is dropped without close()
+            self._finalizer = weakref.finalize(self, _remove, self.spill_path)
+        with open(self.spill_path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line.encode("utf-8") + b"\n")
+        return offset
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _json_size(message: Message) -> int:
+    return len(message.to_json().encode("utf-8"))
+
+
+def _compact_dict(message: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Returns the compacted copy of a message dict, `None` if unchanged."""
+    changed = False
+    content = []
+    for item in message.get("content") or []:
+        item_type = item.get("type")
+        if item_type == "thinking":
+            changed = True
+            continue
+        if item_type == "table" and item.get("table", {}).get("result_set") is not None:
+            item = {**item, "table": {k: v for k, v in item["table"].items() if k != "result_set"}}
+            changed = True
+        elif item_type == "tool_result":
+            tool_result = item.get("tool_result", {})
+            results = []
+            for result in tool_result.get("content") or []:
+                if result.get("type") == "json" and "result_set" in (result.get("json") or {}):
+                    result = {
+                        **result,
+                        "json": {k: v for k, v in result["json"].items() if k != "result_set"},
+                    }
+                results.append(result)
+            if results != tool_result.get("content"):
+                changed = True
+                item = {**item, "tool_result": {**tool_result, "content": results}}
+        content.append(item)
+    if not changed:
+        return None
+    return {**message, "content": content}
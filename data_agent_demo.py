@@ -1,28 +1,37 @@
 import json
 import os
+import tempfile
+import uuid
 from collections import defaultdict
 
-import numpy as np
-import pandas as pd
-import requests
-import sseclient
 import streamlit as st
 
+from async_agent_client import AsyncAgentClient
+from conversation import Conversation
+from delta_buffer import DeltaBuffer
+from fast_events import (
+    StatusEventData,
+    TextDeltaEventData,
+    ThinkingDeltaEventData,
+    ThinkingEventData,
+)
+from lazy_message import LazyMessage
 from models import (
     ChartEventData,
     DataAgentRunRequest,
     ErrorEventData,
     Message,
     MessageContentItem,
-    StatusEventData,
     TableEventData,
     TextContentItem,
-    TextDeltaEventData,
-    ThinkingDeltaEventData,
-    ThinkingEventData,
     ToolResultEventData,
     ToolUseEventData,
 )
+from rate_limiter import AdaptiveLimiter
+from response_cache import ResponseCache
+from resumable_stream import RESET_EVENT
+from run_manager import RunHandle, RunManager, RunRejected
+from run_timing import RunTimer
 
 PAT = 'your generated pat token goes here'
 HOST = 'orgname-accountname.snowflakecomputing.com'
@@ -34,90 +43,122 @@ AGENT = 'MARKETING_AI'
 DATABASE = 'snowflake_intelligence'
 SCHEMA = 'agents'
 
-def agent_run() -> requests.Response:
-    """Calls the REST API and returns a streaming client."""
-    request_body = DataAgentRunRequest(
-        model="claude-4-sonnet",
-        messages=st.session_state.messages,
-    )
-    resp = requests.post(
-        url=f"https://{HOST}/api/v2/databases/{DATABASE}/schemas/{SCHEMA}/agents/{AGENT}:run",
-        data=request_body.to_json(),
-        headers={
-            "Authorization": f'Bearer {PAT}"',
-            "Content-Type": "application/json",
-        },
-        stream=True,
-        verify=False,
+# Per-session history budget; older turns are compacted and spilled to disk
+HISTORY_MAX_BYTES = 4 * 1024 * 1024
+
+# Seconds to replay identical questions from a local cache, None disables it.
+# Only runs that send their full history are cached, so this turns threads off.
+RESPONSE_CACHE_TTL = None
+
+# Seconds the first page load waits for a conversation thread
+THREAD_TIMEOUT = 5
+
+@st.cache_resource
+def get_run_manager() -> RunManager:
+    """Process-wide run manager, shared by every session and rerun.
+
+    It owns the connection pool and streams the runs of all sessions on one
+    event loop; script threads only render what it hands them.
+    """
+    cache = ResponseCache(ttl=RESPONSE_CACHE_TTL) if RESPONSE_CACHE_TTL else None
+    # Runs from all sessions share one adaptive limit, queued fairly per session
+    limiter = AdaptiveLimiter(initial=8, max_concurrency=32)
+    client = AsyncAgentClient(host=HOST, token=PAT, verify=False, cache=cache, limiter=limiter)
+    return RunManager(client, max_runs_per_session=1)
+
+
+def agent_run(request_body: DataAgentRunRequest) -> RunHandle:
+    """Submits the run and returns the handle streaming its events."""
+    return get_run_manager().submit_data_agent_run(
+        DATABASE, SCHEMA, AGENT, request_body, session=st.session_state.session_id
     )
-    if resp.status_code < 400:
-        return resp  # type: ignore
-    else:
-        raise Exception(f"Failed request with status {resp.status_code}: {resp.text}")
 
 
-def stream_events(response: requests.Response):
+def stream_events(handle: RunHandle, timer: RunTimer):
     content = st.container()
     # Content index to container section mapping
     content_map = defaultdict(content.empty)
     # Content index to text buffer
-    buffers = defaultdict(str)
+    buffers = defaultdict(DeltaBuffer)
+    # Content index to function rendering the buffered text
+    renderers = {}
     spinner = st.spinner("Waiting for response...")
     spinner.__enter__()
 
-    events = sseclient.SSEClient(response).events()
-    for event in events:
-        match event.event:
+    def flush_pending():
+        for idx, buffer in buffers.items():
+            if buffer.pending:
+                renderers[idx](buffer.flush())
+
+    # The run is read on the manager's event loop, so slow renders don't
+    # stall it. Dropped connections are re-run with the content already
+    # rendered skipped, or after a reset if the rerun answers differently,
+    # and deltas that piled up arrive merged.
+    events = timer.wrap(handle)
+    for event, event_data in events:
+        if event not in ("response.text.delta", "response.thinking.delta"):
+            # Show any throttled deltas before rendering anything else
+            flush_pending()
+        match event:
             case "response.status":
                 spinner.__exit__(None, None, None)
-                data = StatusEventData.from_json(event.data)
+                data = StatusEventData.from_json(event_data)
                 spinner = st.spinner(data.message)
                 spinner.__enter__()
             case "response.text.delta":
-                data = TextDeltaEventData.from_json(event.data)
-                buffers[data.content_index] += data.text
-                content_map[data.content_index].write(buffers[data.content_index])
+                data = TextDeltaEventData.from_json(event_data)
+                renderers[data.content_index] = content_map[data.content_index].write
+                if buffers[data.content_index].append(data.text):
+                    renderers[data.content_index](buffers[data.content_index].flush())
             case "response.thinking.delta":
-                data = ThinkingDeltaEventData.from_json(event.data)
-                buffers[data.content_index] += data.text
-                content_map[data.content_index].expander(
-                    "Thinking", expanded=True
-                ).write(buffers[data.content_index])
+                data = ThinkingDeltaEventData.from_json(event_data)
+                placeholder = content_map[data.content_index]
+                renderers[data.content_index] = lambda text, placeholder=placeholder: (
+                    placeholder.expander("Thinking", expanded=True).write(text)
+                )
+                if buffers[data.content_index].append(data.text):
+                    renderers[data.content_index](buffers[data.content_index].flush())
             case "response.thinking":
                 # Thinking done, close the expander
-                data = ThinkingEventData.from_json(event.data)
+                data = ThinkingEventData.from_json(event_data)
                 content_map[data.content_index].expander("Thinking").write(data.text)
             case "response.tool_use":
-                data = ToolUseEventData.from_json(event.data)
+                data = ToolUseEventData.from_json(event_data)
                 content_map[data.content_index].expander("Tool use").json(data)
             case "response.tool_result":
-                data = ToolResultEventData.from_json(event.data)
+                data = ToolResultEventData.from_json(event_data)
                 content_map[data.content_index].expander("Tool result").json(data)
             case "response.chart":
-                data = ChartEventData.from_json(event.data)
+                data = ChartEventData.from_json(event_data)
                 spec = json.loads(data.chart_spec)
                 content_map[data.content_index].vega_lite_chart(
                     spec,
                     use_container_width=True,
                 )
             case "response.table":
-                data = TableEventData.from_json(event.data)
-                data_array = np.array(data.result_set.data)
-                column_names = [
-                    col.name for col in data.result_set.result_set_meta_data.row_type
-                ]
+                data = TableEventData.from_json(event_data)
                 content_map[data.content_index].dataframe(
-                    pd.DataFrame(data_array, columns=column_names)
+                    to_dataframe(data.result_set)
                 )
+            case "metadata":
+                st.session_state.conversation.observe_metadata(event_data)
+            case _ if event == RESET_EVENT:
+                # The rerun of a dropped stream differs, redraw it from scratch
+                for placeholder in content_map.values():
+                    placeholder.empty()
+                content_map.clear()
+                buffers.clear()
+                renderers.clear()
             case "error":
-                data = ErrorEventData.from_json(event.data)
+                data = ErrorEventData.from_json(event_data)
                 st.error(f"Error: {data.message} (code: {data.code})")
                 # Remove last user message, so we can retry from last successful response.
-                st.session_state.messages.pop()
+                st.session_state.conversation.discard_last_user_message()
                 return
             case "response":
-                data = Message.from_json(event.data)
-                st.session_state.messages.append(data)
+                data = LazyMessage.from_json(event_data)
+                st.session_state.conversation.add_assistant_message(data)
+    flush_pending()
     spinner.__exit__(None, None, None)
 
 
@@ -127,15 +168,31 @@ def process_new_message(prompt: str) -> None:
         content=[MessageContentItem(TextContentItem(type="text", text=prompt))],
     )
     render_message(message)
-    st.session_state.messages.append(message)
+    st.session_state.conversation.add_user_message(message)
 
     with st.chat_message("assistant"):
-        with st.spinner("Sending request..."):
-            response = agent_run()
-        st.markdown(
-            f"```request_id: {response.headers.get('X-Snowflake-Request-Id')}```"
+        request_body = st.session_state.conversation.build_request(
+            DataAgentRunRequest,
+            model="claude-4-sonnet",
         )
-        stream_events(response)
+        timer = RunTimer()
+        try:
+            handle = agent_run(request_body)
+        except RunRejected:
+            st.error("Too many questions in flight right now, please retry shortly.")
+            st.session_state.conversation.discard_last_user_message()
+            return
+        with st.spinner("Sending request..."):
+            timer.headers(handle.headers())
+        st.markdown(f"```request_id: {handle.request_id}```")
+        stream_events(handle, timer)
+
+
+def to_dataframe(result_set):
+    # numpy and pandas are only imported once the first table is shown
+    from result_sets import to_dataframe
+
+    return to_dataframe(result_set)
 
 
 def render_message(msg: Message):
@@ -148,14 +205,12 @@ def render_message(msg: Message):
                     spec = json.loads(content_item.actual_instance.chart.chart_spec)
                     st.vega_lite_chart(spec, use_container_width=True)
                 case "table":
-                    data_array = np.array(
-                        content_item.actual_instance.table.result_set.data
-                    )
-                    column_names = [
-                        col.name
-                        for col in content_item.actual_instance.table.result_set.result_set_meta_data.row_type
-                    ]
-                    st.dataframe(pd.DataFrame(data_array, columns=column_names))
+                    table = content_item.actual_instance.table
+                    if table.result_set is None:
+                        # Compacted out of the history
+                        st.caption(f"{table.title or 'Table'} (query {table.query_id})")
+                    else:
+                        st.dataframe(to_dataframe(table.result_set))
                 case _:
                     st.expander(content_item.actual_instance.type).json(
                         content_item.actual_instance.to_json()
@@ -164,10 +219,30 @@ def render_message(msg: Message):
 
 st.title("Cortex Agent")
 
-if "messages" not in st.session_state:
-    st.session_state.messages = []
-
-for message in st.session_state.messages:
+def new_conversation() -> Conversation:
+    """Starts a server-side thread, falling back to resending full history."""
+    options = dict(max_bytes=HISTORY_MAX_BYTES, spill_dir=tempfile.gettempdir())
+    thread_id = None
+    if not RESPONSE_CACHE_TTL:
+        # A threaded run learns the next parent_message_id from `metadata`
+        # events, which cortexagent-run.yaml doesn't define. If the server
+        # sends none, the conversation drops the thread after the first turn
+        # and resends the full history.
+        try:
+            thread_id = get_run_manager().create_thread(
+                "data_agent_demo", timeout=THREAD_TIMEOUT
+            )
+        except Exception as e:
+            st.warning(f"Could not start a conversation thread, sending full history instead: {e}")
+    return Conversation(thread_id=thread_id, **options)
+
+
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if "conversation" not in st.session_state:
+    st.session_state.conversation = new_conversation()
+
+for message in st.session_state.conversation.messages:
     render_message(message)
 
 if user_input := st.chat_input("What is your question?"):
@@ -0,0 +1,54 @@
+import time
+from typing import Callable, List
+
+
+class DeltaBuffer:
+    """Accumulates streamed text deltas for one content index.
+
+    Chunks are kept in a list and only joined when the text is read, so
+    appending a delta is O(1) instead of copying the whole response so far.
+    `append` reports when the buffer is due for re-rendering, which bounds the
+    number of UI updates to one per `flush_interval` seconds or per
+    `flush_tokens` deltas, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 0.1,
+        flush_tokens: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.flush_tokens = flush_tokens
+        self._clock = clock
+        self._chunks: List[str] = []
+        self._pending = 0
+        # The first delta is always due, so the answer starts rendering at once
+        self._last_flush = float("-inf")
+
+    @property
+    def pending(self) -> int:
+        """Number of deltas appended since the last flush."""
+        return self._pending
+
+    def append(self, text: str) -> bool:
+        """Adds a delta and returns whether the buffer should be flushed."""
+        self._chunks.append(text)
+        self._pending += 1
+        return (
+            self._pending >= self.flush_tokens
+            or self._clock() - self._last_flush >= self.flush_interval
+        )
+
+    def getvalue(self) -> str:
+        """Returns the accumulated text."""
+        if len(self._chunks) > 1:
+            # Collapse so repeated reads don't re-join the same chunks
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def flush(self) -> str:
+        """Returns the accumulated text and resets the flush counters."""
+        self._pending = 0
+        self._last_flush = self._clock()
+        return self.getvalue()
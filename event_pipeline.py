@@ -0,0 +1,134 @@
+import json
+import queue
+import threading
+from typing import Iterable, Iterator, List, Optional
+
+from sse_decoder import SSEFrame
+
+# Deltas whose `text` can be merged when they follow each other
+COALESCED_EVENTS = frozenset(["response.text.delta", "response.thinking.delta"])
+
+# Put on the queue of `iter_batches` after the last frame
+DONE = object()
+
+
+class EventPipeline:
+    """Reads frames on a background thread, hands them over through a bounded queue.
+
+    The reader thread drives `frames` (network reads, SSE decoding and
+    anything else wrapped around them), so a slow render never leaves the
+    socket unread. Once `maxsize` frames are waiting the reader blocks,
+    which bounds memory and pushes back on the server like a plain read
+    loop would.
+
+    The consumer takes everything queued at once and merges consecutive
+    text or thinking deltas of the same `content_index` into one frame, so
+    a renderer that falls behind catches up with one update instead of one
+    per token. Iterate it from the thread that renders; closing the
+    iterator (or breaking out of the loop) stops the reader.
+    """
+
+    def __init__(self, frames: Iterable[SSEFrame], maxsize: int = 256, coalesce: bool = True) -> None:
+        self.frames = frames
+        self.coalesce = coalesce
+        self._queue: "queue.Queue" = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read, name="event-pipeline", daemon=True)
+        self._thread.start()
+
+    def __iter__(self) -> Iterator[SSEFrame]:
+        try:
+            for batch in iter_batches(self._queue):
+                yield from (coalesce(batch) if self.coalesce else batch)
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops the reader thread; frames not consumed yet are dropped.
+
+        The reader notices within 0.1s, or after its current read returns.
+        """
+        self._stop.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                return
+
+    def _read(self) -> None:
+        iterator = iter(self.frames)
+        try:
+            for frame in iterator:
+                if not self._put(frame):
+                    return
+            self._put(DONE)
+        except Exception as e:
+            self._put(e)
+        finally:
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+
+def iter_batches(frames: "queue.Queue") -> Iterator[List[SSEFrame]]:
+    """Yields the frames put on `frames` in batches, until `DONE`.
+
+    Each batch waits for one frame and takes whatever else piled up while
+    the previous batch was consumed. An exception put on the queue is
+    raised after the frames before it.
+    """
+    get = frames.get
+    get_nowait = frames.get_nowait
+    while True:
+        batch = [get()]
+        while batch[-1] is not DONE and not isinstance(batch[-1], BaseException):
+            try:
+                batch.append(get_nowait())
+            except queue.Empty:
+                break
+        end = batch[-1]
+        if end is DONE or isinstance(end, BaseException):
+            batch.pop()
+        yield batch
+        if end is DONE:
+            return
+        if isinstance(end, BaseException):
+            raise end
+
+
+def coalesce(frames: List[SSEFrame]) -> List[SSEFrame]:
+    """Merges runs of text/thinking deltas for the same content index."""
+    if len(frames) < 2:
+        return frames
+    merged: List[SSEFrame] = []
+    run: Optional[dict] = None
+    run_event = None
+    run_data = None
+    count = 0
+    for event, data in frames:
+        if event in COALESCED_EVENTS:
+            payload = json.loads(data)
+            if run is not None and event == run_event and payload.get("content_index") == run.get("content_index"):
+                run["text"] += payload["text"]
+                count += 1
+                continue
+            if run is not None:
+                merged.append((run_event, json.dumps(run) if count > 1 else run_data))
+            run, run_event, run_data, count = payload, event, data, 1
+            continue
+        if run is not None:
+            merged.append((run_event, json.dumps(run) if count > 1 else run_data))
+            run = None
+        merged.append((event, data))
+    if run is not None:
+        merged.append((run_event, json.dumps(run) if count > 1 else run_data))
+    return merged
@@ -0,0 +1,131 @@
+"""Non-validating counterparts of the flat inbound `*EventData` models.
+
+The generated pydantic models validate every field of every event, which is
+pure overhead for the millions of deltas a server streams back. The classes
+here have the same names, attributes and `from_dict`/`from_json`/`to_dict`/
+`to_json` methods, but are plain `__slots__` objects that trust the server
+payload. Opt in by importing from this module instead of `models`; events
+with nested content (tables, tool results, the final response) have no fast
+variant and should still be decoded with the generated models, as should
+anything sent back to the server.
+"""
+
+import json
+from typing import Any, ClassVar, Dict, Optional, Type
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+import models
+
+
+class FastEventData:
+    """Base class, subclasses list their fields in `__slots__`."""
+
+    __slots__ = ()
+    # The generated model this class mirrors
+    model: ClassVar[Type[BaseModel]]
+
+    def __init__(self, **kwargs: Any) -> None:
+        for name in self.__slots__:
+            setattr(self, name, kwargs.get(name))
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create an instance from a dict, without validation"""
+        if obj is None:
+            return None
+        instance = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(instance, name, obj.get(name))
+        return instance
+
+    @classmethod
+    def from_json(cls, json_str: str) -> Optional[Self]:
+        """Create an instance from a JSON string, without validation"""
+        return cls.from_dict(json.loads(json_str))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary representation, omitting `None` fields"""
+        return {
+            name: value
+            for name in self.__slots__
+            if (value := getattr(self, name)) is not None
+        }
+
+    def to_json(self) -> str:
+        """Returns the JSON representation"""
+        return json.dumps(self.to_dict())
+
+    def to_model(self) -> BaseModel:
+        """Returns the validated generated model"""
+        return self.model.from_dict(self.to_dict())
+
+
+class TextDeltaEventData(FastEventData):
+    __slots__ = ("content_index", "text", "is_elicitation")
+    model = models.TextDeltaEventData
+
+
+class ThinkingDeltaEventData(FastEventData):
+    __slots__ = ("content_index", "text")
+    model = models.ThinkingDeltaEventData
+
+
+class ThinkingEventData(FastEventData):
+    __slots__ = ("content_index", "text")
+    model = models.ThinkingEventData
+
+
+class StatusEventData(FastEventData):
+    __slots__ = ("status", "message")
+    model = models.StatusEventData
+
+
+class ToolResultStatusEventData(FastEventData):
+    __slots__ = ("tool_use_id", "tool_type", "status", "message")
+    model = models.ToolResultStatusEventData
+
+
+class ToolUseEventData(FastEventData):
+    __slots__ = ("content_index", "tool_use_id", "type", "name", "input")
+    model = models.ToolUseEventData
+
+
+class ChartEventData(FastEventData):
+    __slots__ = ("content_index", "tool_use_id", "chart_spec", "analyst_tool_use_id")
+    model = models.ChartEventData
+
+
+class ErrorEventData(FastEventData):
+    __slots__ = ("code", "message", "request_id")
+    model = models.ErrorEventData
+
+
+# SSE event name to the class decoding its data, fast where one exists
+EVENT_DATA_CLASSES: Dict[str, Any] = {
+    "response": models.ResponseEventData,
+    "response.text": models.TextEventData,
+    "response.text.delta": TextDeltaEventData,
+    "response.text.annotation": models.ResponseTextAnnotationEventData,
+    "response.thinking": ThinkingEventData,
+    "response.thinking.delta": ThinkingDeltaEventData,
+    "response.tool_use": ToolUseEventData,
+    "response.tool_result": models.ToolResultEventData,
+    "response.tool_result.status": ToolResultStatusEventData,
+    "response.tool_result.analyst.delta": models.AnalystToolResultDeltaEventData,
+    "response.table": models.TableEventData,
+    "response.chart": ChartEventData,
+    "response.status": StatusEventData,
+    "response.suggested_queries": models.SuggestedQueriesEventData,
+    "error": ErrorEventData,
+}
@@ -0,0 +1,115 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from pydantic import PrivateAttr
+from typing_extensions import Self
+
+from models import Message, MessageContentItem
+
+_ROLES = frozenset(["user", "assistant"])
+
+
+class LazyContent(list):
+    """`Message.content` that keeps the raw item dicts and only builds each
+    `MessageContentItem` the first time it is read.
+
+    Materialized items replace their dict in place, so every item is
+    decoded at most once. Items that were never read are serialized straight
+    from the original dicts.
+    """
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._materialize(index, list.__getitem__(self, index))
+
+    def __iter__(self) -> Iterator[MessageContentItem]:
+        for i in range(len(self)):
+            yield self._materialize(i, list.__getitem__(self, i))
+
+    def _materialize(self, index: int, item: Any) -> MessageContentItem:
+        if isinstance(item, dict):
+            item = MessageContentItem.from_dict(item)
+            list.__setitem__(self, index, item)
+        return item
+
+    @property
+    def materialized(self) -> int:
+        """Number of items decoded so far."""
+        return sum(1 for item in list.__iter__(self) if not isinstance(item, dict))
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            item if isinstance(item, dict) else item.to_dict()
+            for item in list.__iter__(self)
+        ]
+
+
+class LazyMessage(Message):
+    """Read-only `Message` view over the final `response` event payload.
+
+    `from_json` only parses the JSON envelope; content items stay plain
+    dicts until they are accessed (see `LazyContent`), so a run that ends
+    with a large table does not pay for validating it before the answer can
+    be shown, and history turns that are never rendered again are never
+    turned into models.
+
+    `to_json` returns the original payload as received, so the message goes
+    back into the next request's history byte-for-byte. Treat instances as
+    immutable; use `to_message()` to get a regular, validated `Message`.
+    """
+    _raw_json: Optional[str] = PrivateAttr(default=None)
+
+    @classmethod
+    def from_json(cls, json_str: Union[str, bytes]) -> Optional[Self]:
+        """Create a LazyMessage from the `response` event data"""
+        message = cls.from_dict(json.loads(json_str))
+        if isinstance(json_str, bytes):
+            json_str = json_str.decode("utf-8")
+        message._raw_json = json_str
+        return message
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> Optional[Self]:
+        """Create a LazyMessage from a dict without validating its content"""
+        if obj is None:
+            return None
+
+        if not isinstance(obj, dict):
+            return cls.model_validate(obj)
+
+        role = obj.get("role")
+        if role not in _ROLES:
+            raise ValueError("must be one of enum values ('user', 'assistant')")
+        if not isinstance(obj.get("content"), list):
+            raise ValueError(f"LazyMessage content must be a list, got {obj.get('content')!r}")
+
+        fields = {"role": role, "content": LazyContent(obj["content"])}
+        if obj.get("schema_version") is not None:
+            fields["schema_version"] = obj["schema_version"]
+        return cls.model_construct(**fields)
+
+    def to_json(self) -> str:
+        """Returns the original JSON payload when there is one"""
+        if self._raw_json is not None:
+            return self._raw_json
+        return json.dumps(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the dict representation without decoding untouched items"""
+        content = self.content
+        _dict: Dict[str, Any] = {
+            "role": self.role,
+            "content": (
+                content.to_dicts()
+                if isinstance(content, LazyContent)
+                else [item.to_dict() for item in content]
+            ),
+        }
+        if self.schema_version is not None:
+            _dict["schema_version"] = self.schema_version
+        return _dict
+
+    def to_message(self) -> Message:
+        """Returns a fully validated `Message` with the same content"""
+        return Message.from_dict(self.to_dict())
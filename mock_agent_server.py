@@ -0,0 +1,349 @@
+"""Local stand-in for the Cortex Agent `:run` endpoints.
+
+Serves recorded or synthetic SSE streams with configurable pacing, chunk
+fragmentation and failures, so the client pipeline can be exercised and
+load-tested without a Snowflake account:
+
+    python -m mock_agent_server --port 8080 --text-tokens 2000 --token-delay 0.01
+
+and point a client at it with `host="127.0.0.1:8080", scheme="http"`.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aiohttp import web
+
+from request_compression import decompress
+from sse_decoder import iter_sse
+
+# (event, data) pair as served, `data` is the already parsed JSON payload
+Frame = Tuple[str, Any]
+
+
+def encode_frame(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def synthetic_stream(
+    text_tokens: int = 50,
+    thinking_tokens: int = 20,
+    tool_calls: int = 1,
+    table_rows: int = 10,
+    table_columns: int = 4,
+) -> List[Frame]:
+    """Returns a plausible run covering every non-error `ServerSentEvent` type.
+
+    The run thinks, calls Cortex Analyst `tool_calls` times (each producing a
+    table and a chart), streams a cited answer, suggests follow-up queries
+    and ends with the aggregated `response` event. `error` events are
+    injected by `MockAgentServer(error_after=...)`.
+    """
+    frames: List[Frame] = []
+    content: List[Dict[str, Any]] = []
+    frames.append(("response.status", {"status": "planning", "message": "Planning the next steps"}))
+
+    thinking = [f"step {i} " for i in range(thinking_tokens)]
+    index = len(content)
+    for token in thinking:
+        frames.append(("response.thinking.delta", {"content_index": index, "text": token}))
+    frames.append(("response.thinking", {"content_index": index, "text": "".join(thinking)}))
+    content.append({"type": "thinking", "thinking": {"text": "".join(thinking)}})
+
+    row_type = [
+        {"name": "REGION", "type": "text", "length": 100, "precision": 0, "scale": 0, "nullable": True}
+    ] + [
+        {"name": f"METRIC_{i}", "type": "fixed", "length": 0, "precision": 38, "scale": 2, "nullable": True}
+        for i in range(1, table_columns)
+    ]
+    for call in range(tool_calls):
+        tool_use_id = f"toolu_{call}"
+        query_id = f"01b2c3d4-0000-0000-0000-{call:012d}"
+        tool_use = {
+            "tool_use_id": tool_use_id,
+            "type": "cortex_analyst_text2sql",
+            "name": "Analyst1",
+            "input": {"query": "What are the total deal values by region?"},
+        }
+        index = len(content)
+        frames.append(("response.tool_use", {"content_index": index, **tool_use}))
+        content.append({"type": "tool_use", "tool_use": tool_use})
+
+        sql = "SELECT region, SUM(deal_value) FROM sales_metrics GROUP BY region"
+        for status in ("interpreting_question", "generating_sql", "executing_sql"):
+            frames.append(
+                (
+                    "response.tool_result.status",
+                    {"tool_use_id": tool_use_id, "tool_type": "cortex_analyst_text2sql", "status": status, "message": status.replace("_", " ")},
+                )
+            )
+        for delta in ({"think": "The user wants totals by region. "}, {"sql": sql}, {"sql_explanation": "Sums deal value per region."}, {"query_id": query_id}):
+            frames.append(
+                (
+                    "response.tool_result.analyst.delta",
+                    {"content_index": index + 1, "tool_use_id": tool_use_id, "tool_type": "cortex_analyst_text2sql", "tool_name": "Analyst1", "delta": delta},
+                )
+            )
+        result_set = {
+            "statementHandle": query_id,
+            "resultSetMetaData": {"partition": 0, "numRows": table_rows, "format": "jsonv2", "rowType": row_type},
+            "data": [
+                [f"region {row}"] + [f"{row * column}.50" for column in range(1, table_columns)]
+                for row in range(table_rows)
+            ],
+        }
+        tool_result = {
+            "tool_use_id": tool_use_id,
+            "type": "cortex_analyst_text2sql",
+            "name": "Analyst1",
+            "content": [{"type": "json", "json": {"sql": sql, "query_id": query_id}}],
+            "status": "success",
+        }
+        index = len(content)
+        frames.append(("response.tool_result", {"content_index": index, **tool_result}))
+        content.append({"type": "tool_result", "tool_result": tool_result})
+
+        table = {"tool_use_id": tool_use_id, "query_id": query_id, "result_set": result_set, "title": "Deal value by region"}
+        index = len(content)
+        frames.append(("response.table", {"content_index": index, **table}))
+        content.append({"type": "table", "table": table})
+
+        chart_spec = json.dumps(
+            {
+                "mark": "bar",
+                "encoding": {"x": {"field": "REGION", "type": "nominal"}, "y": {"field": "METRIC_1", "type": "quantitative"}},
+            }
+        )
+        chart = {"tool_use_id": tool_use_id, "chart_spec": chart_spec}
+        index = len(content)
+        frames.append(("response.chart", {"content_index": index, **chart}))
+        content.append({"type": "chart", "chart": chart})
+
+    frames.append(("response.status", {"status": "streaming_analyst_results", "message": "Writing the answer"}))
+    text = [f"token{i} " for i in range(text_tokens)]
+    index = len(content)
+    for token in text:
+        frames.append(("response.text.delta", {"content_index": index, "text": token}))
+    annotation = {
+        "type": "cortex_search_citation",
+        "index": 1,
+        "search_result_id": "cs_1",
+        "doc_id": "doc_1",
+        "doc_title": "Call transcript",
+        "text": "The customer confirmed the renewal.",
+    }
+    frames.append(("response.text.annotation", {"content_index": index, "annotation_index": 0, "annotation": annotation}))
+    frames.append(("response.text", {"content_index": index, "text": "".join(text), "annotations": [annotation]}))
+    content.append({"type": "text", "text": "".join(text), "annotations": [annotation]})
+
+    suggested = [{"query": "Which region grew fastest?"}, {"query": "Show the top 5 deals"}]
+    index = len(content)
+    frames.append(("response.suggested_queries", {"content_index": index, "suggested_queries": suggested}))
+    content.append({"type": "suggested_queries", "suggested_queries": suggested})
+
+    frames.append(("response", {"role": "assistant", "content": content}))
+    return frames
+
+
+def load_recording(path: str) -> List[Frame]:
+    """Reads a stream captured by `record`."""
+    with open(path, "rb") as f:
+        return [(event, json.loads(data)) for event, data in iter_sse([f.read()])]
+
+
+def record(chunks: Iterable[bytes], path: str) -> Iterator[bytes]:
+    """Passes raw response chunks through while writing them to `path`.
+
+    Wrap a live stream to capture it for replay, e.g.
+    `iter_sse(record(response.iter_content(chunk_size=None), "run.sse"))`.
+    """
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            yield chunk
+
+
+class MockAgentServer:
+    """aiohttp application serving `dataAgentRun`, `agentRun` and thread creation.
+
+    Every run replays `frames` (a synthetic stream by default). Requests
+    bodies are kept in `requests` for inspection.
+    """
+
+    def __init__(
+        self,
+        frames: Optional[List[Frame]] = None,
+        token_delay: float = 0.0,
+        first_event_delay: float = 0.0,
+        chunk_size: Optional[int] = None,
+        fail_rate: float = 0.0,
+        fail_status: int = 503,
+        retry_after: Optional[float] = None,
+        error_after: Optional[int] = None,
+        disconnect_after: Optional[int] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            frames: Events to serve for every run.
+            token_delay: Seconds to wait before each event after the first.
+            first_event_delay: Seconds between the response headers and the
+                first event, i.e. the simulated time to first token.
+            chunk_size: When set, the body is written in random pieces of 1 to
+                `chunk_size` bytes, splitting frames at arbitrary points.
+            fail_rate: Probability of rejecting a run with `fail_status`.
+            fail_status: HTTP status used for rejected runs, e.g. 429 or 503.
+            retry_after: `Retry-After` seconds sent with rejected runs.
+            error_after: Replace the rest of the stream with an `error` event
+                after this many events.
+            disconnect_after: Drop the connection after this many events.
+            seed: Seed for the fragmentation and failure randomness.
+        """
+        self.frames = frames if frames is not None else synthetic_stream()
+        self.token_delay = token_delay
+        self.first_event_delay = first_event_delay
+        self.chunk_size = chunk_size
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.error_after = error_after
+        self.disconnect_after = disconnect_after
+        self.random = random.Random(seed)
+        self.requests: List[Dict[str, Any]] = []
+        self._thread_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self.app = web.Application()
+        self.app.router.add_post(
+            "/api/v2/databases/{database}/schemas/{schema}/agents/{name}:run", self.run
+        )
+        self.app.router.add_post("/api/v2/cortex/agent:run", self.run)
+        self.app.router.add_post("/api/v2/cortex/threads", self.create_thread)
+
+    async def create_thread(self, request: web.Request) -> web.Response:
+        return web.json_response({"thread_id": next(self._thread_ids)})
+
+    async def run(self, request: web.Request) -> web.StreamResponse:
+        # aiohttp already inflates gzip and deflate bodies
+        if request.headers.get("Content-Encoding") == "zstd":
+            body = json.loads(decompress(await request.read(), "zstd"))
+        else:
+            body = await request.json()
+        self.requests.append(body)
+        if self.fail_rate and self.random.random() < self.fail_rate:
+            headers = {}
+            if self.retry_after is not None:
+                headers["Retry-After"] = str(self.retry_after)
+            return web.json_response(
+                {"code": str(self.fail_status), "message": "Injected failure"},
+                status=self.fail_status,
+                headers=headers,
+            )
+
+        frames = list(self.frames)
+        if body.get("thread_id") is not None:
+            # Report the ids of the new turn, as a threaded run does
+            frames.insert(0, ("metadata", {"metadata": {"role": "user", "message_id": next(self._message_ids)}}))
+            frames.insert(-1, ("metadata", {"metadata": {"role": "assistant", "message_id": next(self._message_ids)}}))
+        if self.error_after is not None:
+            frames = frames[: self.error_after] + [
+                ("error", {"code": "399504", "message": "Injected error", "request_id": request.headers.get("X-Request-Id", "mock")})
+            ]
+
+        response = web.StreamResponse(
+            headers={"Content-Type": "text/event-stream", "X-Snowflake-Request-Id": f"mock-{len(self.requests)}"}
+        )
+        await response.prepare(request)
+        await asyncio.sleep(self.first_event_delay)
+        for count, (event, data) in enumerate(frames):
+            if count == self.disconnect_after:
+                request.transport.close()
+                return response
+            if count and self.token_delay:
+                await asyncio.sleep(self.token_delay)
+            await self._write(response, encode_frame(event, data))
+        await response.write_eof()
+        return response
+
+    async def _write(self, response: web.StreamResponse, payload: bytes) -> None:
+        if not self.chunk_size:
+            await response.write(payload)
+            return
+        view = memoryview(payload)
+        while view:
+            size = self.random.randint(1, self.chunk_size)
+            await response.write(bytes(view[:size]))
+            view = view[size:]
+
+    @contextmanager
+    def serve_in_thread(self, port: int = 0) -> Iterator[str]:
+        """Serves on a background event loop and yields the `host:port`."""
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.app)
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", port)
+        loop.run_until_complete(site.start())
+        host = "127.0.0.1:%d" % site._server.sockets[0].getsockname()[1]
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield host
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.run_until_complete(runner.cleanup())
+            loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Cortex Agent server")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--recording", help="replay a stream captured with `record`")
+    parser.add_argument("--text-tokens", type=int, default=50)
+    parser.add_argument("--thinking-tokens", type=int, default=20)
+    parser.add_argument("--tool-calls", type=int, default=1)
+    parser.add_argument("--table-rows", type=int, default=10)
+    parser.add_argument("--table-columns", type=int, default=4)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--first-event-delay", type=float, default=0.0)
+    parser.add_argument("--chunk-size", type=int)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--fail-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float)
+    parser.add_argument("--error-after", type=int)
+    parser.add_argument("--disconnect-after", type=int)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.recording:
+        frames = load_recording(args.recording)
+    else:
+        frames = synthetic_stream(
+            text_tokens=args.text_tokens,
+            thinking_tokens=args.thinking_tokens,
+            tool_calls=args.tool_calls,
+            table_rows=args.table_rows,
+            table_columns=args.table_columns,
+        )
+    server = MockAgentServer(
+        frames=frames,
+        token_delay=args.token_delay,
+        first_event_delay=args.first_event_delay,
+        chunk_size=args.chunk_size,
+        fail_rate=args.fail_rate,
+        fail_status=args.fail_status,
+        retry_after=args.retry_after,
+        error_after=args.error_after,
+        disconnect_after=args.disconnect_after,
+        seed=args.seed,
+    )
+    web.run_app(server.app, host="127.0.0.1", port=args.port)
+
+
+if __name__ == "__main__":
+    main()
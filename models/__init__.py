@@ -14,79 +14,180 @@
 """  # noqa: E501
 
 
-# import models into model package
-from models.analyst_resource import AnalystResource
-from models.analyst_tool_result_delta_content_item import AnalystToolResultDeltaContentItem
-from models.analyst_tool_result_delta_event import AnalystToolResultDeltaEvent
-from models.analyst_tool_result_delta_event_data import AnalystToolResultDeltaEventData
-from models.annotation import Annotation
-from models.chart_content import ChartContent
-from models.chart_content_item import ChartContentItem
-from models.chart_event import ChartEvent
-from models.chart_event_data import ChartEventData
-from models.content_item_event import ContentItemEvent
-from models.cortex_analyst_suggestion_delta import CortexAnalystSuggestionDelta
-from models.cortex_analyst_tool_result_delta import CortexAnalystToolResultDelta
-from models.cortex_search_citation import CortexSearchCitation
-from models.data_agent_run_request import DataAgentRunRequest
-from models.data_agent_run_request_execution_trace import DataAgentRunRequestExecutionTrace
-from models.error_event import ErrorEvent
-from models.error_event_data import ErrorEventData
-from models.error_response import ErrorResponse
-from models.lite_agent_run_request import LiteAgentRunRequest
-from models.lite_agent_run_request_instructions import LiteAgentRunRequestInstructions
-from models.lite_agent_run_request_models import LiteAgentRunRequestModels
-from models.message import Message
-from models.message_content_item import MessageContentItem
-from models.response_event import ResponseEvent
-from models.response_event_data import ResponseEventData
-from models.response_text_annotation_event import ResponseTextAnnotationEvent
-from models.response_text_annotation_event_data import ResponseTextAnnotationEventData
-from models.result_set import ResultSet
-from models.result_set_meta_data import ResultSetMetaData
-from models.row_type import RowType
-from models.search_resource import SearchResource
-from models.server_sent_event import ServerSentEvent
-from models.status_event import StatusEvent
-from models.status_event_data import StatusEventData
-from models.suggested_queries_content import SuggestedQueriesContent
-from models.suggested_queries_content_item import SuggestedQueriesContentItem
-from models.suggested_queries_event import SuggestedQueriesEvent
-from models.suggested_queries_event_data import SuggestedQueriesEventData
-from models.suggested_query import SuggestedQuery
-from models.table_content import TableContent
-from models.table_content_item import TableContentItem
-from models.table_event import TableEvent
-from models.table_event_data import TableEventData
-from models.text_content import TextContent
-from models.text_content_item import TextContentItem
-from models.text_delta_content_item import TextDeltaContentItem
-from models.text_delta_event import TextDeltaEvent
-from models.text_delta_event_data import TextDeltaEventData
-from models.text_event import TextEvent
-from models.text_event_data import TextEventData
-from models.thinking_content import ThinkingContent
-from models.thinking_content_item import ThinkingContentItem
-from models.thinking_delta_content_item import ThinkingDeltaContentItem
-from models.thinking_delta_event import ThinkingDeltaEvent
-from models.thinking_delta_event_data import ThinkingDeltaEventData
-from models.thinking_event import ThinkingEvent
-from models.thinking_event_data import ThinkingEventData
-from models.tool import Tool
-from models.tool_choice import ToolChoice
-from models.tool_result import ToolResult
-from models.tool_result_content import ToolResultContent
-from models.tool_result_content_item import ToolResultContentItem
-from models.tool_result_content_json import ToolResultContentJSON
-from models.tool_result_content_text import ToolResultContentText
-from models.tool_result_event import ToolResultEvent
-from models.tool_result_event_data import ToolResultEventData
-from models.tool_result_status_event import ToolResultStatusEvent
-from models.tool_result_status_event_data import ToolResultStatusEventData
-from models.tool_tool_spec import ToolToolSpec
-from models.tool_tool_spec_input_schema import ToolToolSpecInputSchema
-from models.tool_use import ToolUse
-from models.tool_use_content_item import ToolUseContentItem
-from models.tool_use_event import ToolUseEvent
-from models.tool_use_event_data import ToolUseEventData
-from models.web_search_citation import WebSearchCitation
+# Models are imported on first attribute access: pydantic builds each class
+# as its module runs, and most callers only need a handful of them
+# (`python -m benchmarks.bench_import_time`). The map below is maintained by
+# hand; add new models to it after regenerating.
+import importlib
+from typing import TYPE_CHECKING
+
+_MODELS = {
+    "AnalystResource": "models.analyst_resource",
+    "AnalystToolResultDeltaContentItem": "models.analyst_tool_result_delta_content_item",
+    "AnalystToolResultDeltaEvent": "models.analyst_tool_result_delta_event",
+    "AnalystToolResultDeltaEventData": "models.analyst_tool_result_delta_event_data",
+    "Annotation": "models.annotation",
+    "ChartContent": "models.chart_content",
+    "ChartContentItem": "models.chart_content_item",
+    "ChartEvent": "models.chart_event",
+    "ChartEventData": "models.chart_event_data",
+    "ContentItemEvent": "models.content_item_event",
+    "CortexAnalystSuggestionDelta": "models.cortex_analyst_suggestion_delta",
+    "CortexAnalystToolResultDelta": "models.cortex_analyst_tool_result_delta",
+    "CortexSearchCitation": "models.cortex_search_citation",
+    "DataAgentRunRequest": "models.data_agent_run_request",
+    "DataAgentRunRequestExecutionTrace": "models.data_agent_run_request_execution_trace",
+    "ErrorEvent": "models.error_event",
+    "ErrorEventData": "models.error_event_data",
+    "ErrorResponse": "models.error_response",
+    "LiteAgentRunRequest": "models.lite_agent_run_request",
+    "LiteAgentRunRequestInstructions": "models.lite_agent_run_request_instructions",
+    "LiteAgentRunRequestModels": "models.lite_agent_run_request_models",
+    "Message": "models.message",
+    "MessageContentItem": "models.message_content_item",
+    "ResponseEvent": "models.response_event",
+    "ResponseEventData": "models.response_event_data",
+    "ResponseTextAnnotationEvent": "models.response_text_annotation_event",
+    "ResponseTextAnnotationEventData": "models.response_text_annotation_event_data",
+    "ResultSet": "models.result_set",
+    "ResultSetMetaData": "models.result_set_meta_data",
+    "RowType": "models.row_type",
+    "SearchResource": "models.search_resource",
+    "ServerSentEvent": "models.server_sent_event",
+    "StatusEvent": "models.status_event",
+    "StatusEventData": "models.status_event_data",
+    "SuggestedQueriesContent": "models.suggested_queries_content",
+    "SuggestedQueriesContentItem": "models.suggested_queries_content_item",
+    "SuggestedQueriesEvent": "models.suggested_queries_event",
+    "SuggestedQueriesEventData": "models.suggested_queries_event_data",
+    "SuggestedQuery": "models.suggested_query",
+    "TableContent": "models.table_content",
+    "TableContentItem": "models.table_content_item",
+    "TableEvent": "models.table_event",
+    "TableEventData": "models.table_event_data",
+    "TextContent": "models.text_content",
+    "TextContentItem": "models.text_content_item",
+    "TextDeltaContentItem": "models.text_delta_content_item",
+    "TextDeltaEvent": "models.text_delta_event",
+    "TextDeltaEventData": "models.text_delta_event_data",
+    "TextEvent": "models.text_event",
+    "TextEventData": "models.text_event_data",
+    "ThinkingContent": "models.thinking_content",
+    "ThinkingContentItem": "models.thinking_content_item",
+    "ThinkingDeltaContentItem": "models.thinking_delta_content_item",
+    "ThinkingDeltaEvent": "models.thinking_delta_event",
+    "ThinkingDeltaEventData": "models.thinking_delta_event_data",
+    "ThinkingEvent": "models.thinking_event",
+    "ThinkingEventData": "models.thinking_event_data",
+    "Tool": "models.tool",
+    "ToolChoice": "models.tool_choice",
+    "ToolResult": "models.tool_result",
+    "ToolResultContent": "models.tool_result_content",
+    "ToolResultContentItem": "models.tool_result_content_item",
+    "ToolResultContentJSON": "models.tool_result_content_json",
+    "ToolResultContentText": "models.tool_result_content_text",
+    "ToolResultEvent": "models.tool_result_event",
+    "ToolResultEventData": "models.tool_result_event_data",
+    "ToolResultStatusEvent": "models.tool_result_status_event",
+    "ToolResultStatusEventData": "models.tool_result_status_event_data",
+    "ToolToolSpec": "models.tool_tool_spec",
+    "ToolToolSpecInputSchema": "models.tool_tool_spec_input_schema",
+    "ToolUse": "models.tool_use",
+    "ToolUseContentItem": "models.tool_use_content_item",
+    "ToolUseEvent": "models.tool_use_event",
+    "ToolUseEventData": "models.tool_use_event_data",
+    "WebSearchCitation": "models.web_search_citation",
+}
+
+__all__ = list(_MODELS)
+
+
+def __getattr__(name):
+    module = _MODELS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODELS))
+
+
+if TYPE_CHECKING:
+    from models.analyst_resource import AnalystResource
+    from models.analyst_tool_result_delta_content_item import AnalystToolResultDeltaContentItem
+    from models.analyst_tool_result_delta_event import AnalystToolResultDeltaEvent
+    from models.analyst_tool_result_delta_event_data import AnalystToolResultDeltaEventData
+    from models.annotation import Annotation
+    from models.chart_content import ChartContent
+    from models.chart_content_item import ChartContentItem
+    from models.chart_event import ChartEvent
+    from models.chart_event_data import ChartEventData
+    from models.content_item_event import ContentItemEvent
+    from models.cortex_analyst_suggestion_delta import CortexAnalystSuggestionDelta
+    from models.cortex_analyst_tool_result_delta import CortexAnalystToolResultDelta
+    from models.cortex_search_citation import CortexSearchCitation
+    from models.data_agent_run_request import DataAgentRunRequest
+    from models.data_agent_run_request_execution_trace import DataAgentRunRequestExecutionTrace
+    from models.error_event import ErrorEvent
+    from models.error_event_data import ErrorEventData
+    from models.error_response import ErrorResponse
+    from models.lite_agent_run_request import LiteAgentRunRequest
+    from models.lite_agent_run_request_instructions import LiteAgentRunRequestInstructions
+    from models.lite_agent_run_request_models import LiteAgentRunRequestModels
+    from models.message import Message
+    from models.message_content_item import MessageContentItem
+    from models.response_event import ResponseEvent
+    from models.response_event_data import ResponseEventData
+    from models.response_text_annotation_event import ResponseTextAnnotationEvent
+    from models.response_text_annotation_event_data import ResponseTextAnnotationEventData
+    from models.result_set import ResultSet
+    from models.result_set_meta_data import ResultSetMetaData
+    from models.row_type import RowType
+    from models.search_resource import SearchResource
+    from models.server_sent_event import ServerSentEvent
+    from models.status_event import StatusEvent
+    from models.status_event_data import StatusEventData
+    from models.suggested_queries_content import SuggestedQueriesContent
+    from models.suggested_queries_content_item import SuggestedQueriesContentItem
+    from models.suggested_queries_event import SuggestedQueriesEvent
+    from models.suggested_queries_event_data import SuggestedQueriesEventData
+    from models.suggested_query import SuggestedQuery
+    from models.table_content import TableContent
+    from models.table_content_item import TableContentItem
+    from models.table_event import TableEvent
+    from models.table_event_data import TableEventData
+    from models.text_content import TextContent
+    from models.text_content_item import TextContentItem
+    from models.text_delta_content_item import TextDeltaContentItem
+    from models.text_delta_event import TextDeltaEvent
+    from models.text_delta_event_data import TextDeltaEventData
+    from models.text_event import TextEvent
+    from models.text_event_data import TextEventData
+    from models.thinking_content import ThinkingContent
+    from models.thinking_content_item import ThinkingContentItem
+    from models.thinking_delta_content_item import ThinkingDeltaContentItem
+    from models.thinking_delta_event import ThinkingDeltaEvent
+    from models.thinking_delta_event_data import ThinkingDeltaEventData
+    from models.thinking_event import ThinkingEvent
+    from models.thinking_event_data import ThinkingEventData
+    from models.tool import Tool
+    from models.tool_choice import ToolChoice
+    from models.tool_result import ToolResult
+    from models.tool_result_content import ToolResultContent
+    from models.tool_result_content_item import ToolResultContentItem
+    from models.tool_result_content_json import ToolResultContentJSON
+    from models.tool_result_content_text import ToolResultContentText
+    from models.tool_result_event import ToolResultEvent
+    from models.tool_result_event_data import ToolResultEventData
+    from models.tool_result_status_event import ToolResultStatusEvent
+    from models.tool_result_status_event_data import ToolResultStatusEventData
+    from models.tool_tool_spec import ToolToolSpec
+    from models.tool_tool_spec_input_schema import ToolToolSpecInputSchema
+    from models.tool_use import ToolUse
+    from models.tool_use_content_item import ToolUseContentItem
+    from models.tool_use_event import ToolUseEvent
+    from models.tool_use_event_data import ToolUseEventData
+    from models.web_search_citation import WebSearchCitation
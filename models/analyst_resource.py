@@ -33,6 +33,7 @@ class AnalystResource(BaseModel):
     __properties: ClassVar[List[str]] = ["semantic_model_file", "semantic_view"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
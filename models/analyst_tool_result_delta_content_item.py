@@ -35,6 +35,7 @@ class AnalystToolResultDeltaContentItem(BaseModel):
     __properties: ClassVar[List[str]] = ["tool_use_id", "tool_type", "tool_name", "delta"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
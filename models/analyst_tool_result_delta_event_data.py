@@ -36,6 +36,7 @@ class AnalystToolResultDeltaEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "tool_use_id", "tool_type", "tool_name", "delta"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
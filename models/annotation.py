@@ -18,6 +18,7 @@ import json
 import pprint
 from pydantic import BaseModel, ConfigDict, Field, StrictStr, ValidationError, field_validator
 from typing import Any, List, Optional
+from models.one_of_registry import OneOfRegistry
 from models.cortex_search_citation import CortexSearchCitation
 from models.web_search_citation import WebSearchCitation
 from pydantic import StrictStr, Field
@@ -38,6 +39,7 @@ class Annotation(BaseModel):
     one_of_schemas: Set[str] = { "CortexSearchCitation", "WebSearchCitation" }
 
     model_config = ConfigDict(
+        defer_build=True,
         validate_assignment=True,
         protected_namespaces=(),
     )
@@ -58,85 +60,19 @@ class Annotation(BaseModel):
 
     @field_validator('actual_instance')
     def actual_instance_must_validate_oneof(cls, v):
-        instance = Annotation.model_construct()
-        error_messages = []
-        match = 0
-        # validate data type: CortexSearchCitation
-        if not isinstance(v, CortexSearchCitation):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `CortexSearchCitation`")
-        else:
-            match += 1
-        # validate data type: WebSearchCitation
-        if not isinstance(v, WebSearchCitation):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `WebSearchCitation`")
-        else:
-            match += 1
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when setting `actual_instance` in Annotation with oneOf schemas: CortexSearchCitation, WebSearchCitation. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when setting `actual_instance` in Annotation with oneOf schemas: CortexSearchCitation, WebSearchCitation. Details: " + ", ".join(error_messages))
-        else:
-            return v
+        return ANNOTATION_REGISTRY.validate(v)
 
     @classmethod
     def from_dict(cls, obj: Union[str, Dict[str, Any]]) -> Self:
-        return cls.from_json(json.dumps(obj))
+        """Returns the object represented by the already parsed dict"""
+        if isinstance(obj, str):
+            return cls.from_json(obj)
+        return ANNOTATION_REGISTRY.construct(cls, obj)
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Returns the object represented by the json string"""
-        instance = cls.model_construct()
-        error_messages = []
-        match = 0
-
-        # use oneOf discriminator to lookup the data type
-        _data_type = json.loads(json_str).get("type")
-        if not _data_type:
-            raise ValueError("Failed to lookup data type from the field `type` in the input.")
-
-        # check if data type is `CortexSearchCitation`
-        if _data_type == "cortex_search_citation":
-            instance.actual_instance = CortexSearchCitation.from_json(json_str)
-            return instance
-
-        # check if data type is `WebSearchCitation`
-        if _data_type == "web_search_citation":
-            instance.actual_instance = WebSearchCitation.from_json(json_str)
-            return instance
-
-        # check if data type is `CortexSearchCitation`
-        if _data_type == "CortexSearchCitation":
-            instance.actual_instance = CortexSearchCitation.from_json(json_str)
-            return instance
-
-        # check if data type is `WebSearchCitation`
-        if _data_type == "WebSearchCitation":
-            instance.actual_instance = WebSearchCitation.from_json(json_str)
-            return instance
-
-        # deserialize data into CortexSearchCitation
-        try:
-            instance.actual_instance = CortexSearchCitation.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into WebSearchCitation
-        try:
-            instance.actual_instance = WebSearchCitation.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when deserializing the JSON string into Annotation with oneOf schemas: CortexSearchCitation, WebSearchCitation. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when deserializing the JSON string into Annotation with oneOf schemas: CortexSearchCitation, WebSearchCitation. Details: " + ", ".join(error_messages))
-        else:
-            return instance
+        return cls.from_dict(json.loads(json_str))
 
     def to_json(self) -> str:
         """Returns the JSON representation of the actual instance"""
@@ -164,3 +100,7 @@ class Annotation(BaseModel):
         return pprint.pformat(self.model_dump())
 
 
+ANNOTATION_REGISTRY = OneOfRegistry("Annotation", "type", {
+    "cortex_search_citation": CortexSearchCitation,
+    "web_search_citation": WebSearchCitation,
+})
@@ -33,6 +33,7 @@ class ChartContent(BaseModel):
     __properties: ClassVar[List[str]] = ["tool_use_id", "chart_spec", "analyst_tool_use_id"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
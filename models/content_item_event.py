@@ -31,6 +31,7 @@ class ContentItemEvent(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -40,6 +40,7 @@ class CortexAnalystToolResultDelta(BaseModel):
     __properties: ClassVar[List[str]] = ["text", "think", "sql", "sql_explanation", "query_id", "verified_query_used", "result_set", "suggestions"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -35,6 +35,7 @@ class CortexSearchCitation(BaseModel):
     __properties: ClassVar[List[str]] = ["index", "search_result_id", "doc_id", "doc_title", "text"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
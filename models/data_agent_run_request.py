@@ -40,6 +40,7 @@ class DataAgentRunRequest(BaseModel):
     __properties: ClassVar[List[str]] = ["thread_id", "parent_message_id", "messages", "execution_trace", "tool_choice", "experimental"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -71,6 +72,7 @@ class DataAgentRunRequest(BaseModel):
           are ignored.
         """
         excluded_fields: Set[str] = set([
+            "messages",
         ])
 
         _dict = self.model_dump(
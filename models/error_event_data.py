@@ -33,6 +33,7 @@ class ErrorEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["code", "message", "request_id"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
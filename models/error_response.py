@@ -34,6 +34,7 @@ class ErrorResponse(BaseModel):
     __properties: ClassVar[List[str]] = ["message", "code", "error_code", "request_id"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
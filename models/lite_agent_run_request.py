@@ -45,6 +45,7 @@ class LiteAgentRunRequest(BaseModel):
     __properties: ClassVar[List[str]] = ["models", "instructions", "messages", "tools", "tool_resources", "tool_choice", "thread_id", "parent_message_id", "experimental"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -76,6 +77,7 @@ class LiteAgentRunRequest(BaseModel):
           are ignored.
         """
         excluded_fields: Set[str] = set([
+            "messages",
         ])
 
         _dict = self.model_dump(
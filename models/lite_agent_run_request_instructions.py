@@ -33,6 +33,7 @@ class LiteAgentRunRequestInstructions(BaseModel):
     __properties: ClassVar[List[str]] = ["response", "orchestration", "system"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -31,6 +31,7 @@ class LiteAgentRunRequestModels(BaseModel):
     __properties: ClassVar[List[str]] = ["orchestration"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -41,6 +41,7 @@ class Message(BaseModel):
         return value
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
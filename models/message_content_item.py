@@ -18,6 +18,7 @@ import json
 import pprint
 from pydantic import BaseModel, ConfigDict, Field, StrictStr, ValidationError, field_validator
 from typing import Any, List, Optional
+from models.one_of_registry import OneOfRegistry
 from models.chart_content_item import ChartContentItem
 from models.suggested_queries_content_item import SuggestedQueriesContentItem
 from models.table_content_item import TableContentItem
@@ -53,6 +54,7 @@ class MessageContentItem(BaseModel):
     one_of_schemas: Set[str] = { "ChartContentItem", "SuggestedQueriesContentItem", "TableContentItem", "TextContentItem", "ThinkingContentItem", "ToolResultContentItem", "ToolUseContentItem" }
 
     model_config = ConfigDict(
+        defer_build=True,
         validate_assignment=True,
         protected_namespaces=(),
     )
@@ -73,190 +75,19 @@ class MessageContentItem(BaseModel):
 
     @field_validator('actual_instance')
     def actual_instance_must_validate_oneof(cls, v):
-        instance = MessageContentItem.model_construct()
-        error_messages = []
-        match = 0
-        # validate data type: TextContentItem
-        if not isinstance(v, TextContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `TextContentItem`")
-        else:
-            match += 1
-        # validate data type: ThinkingContentItem
-        if not isinstance(v, ThinkingContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ThinkingContentItem`")
-        else:
-            match += 1
-        # validate data type: ToolUseContentItem
-        if not isinstance(v, ToolUseContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolUseContentItem`")
-        else:
-            match += 1
-        # validate data type: ToolResultContentItem
-        if not isinstance(v, ToolResultContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolResultContentItem`")
-        else:
-            match += 1
-        # validate data type: TableContentItem
-        if not isinstance(v, TableContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `TableContentItem`")
-        else:
-            match += 1
-        # validate data type: ChartContentItem
-        if not isinstance(v, ChartContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ChartContentItem`")
-        else:
-            match += 1
-        # validate data type: SuggestedQueriesContentItem
-        if not isinstance(v, SuggestedQueriesContentItem):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `SuggestedQueriesContentItem`")
-        else:
-            match += 1
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when setting `actual_instance` in MessageContentItem with oneOf schemas: ChartContentItem, SuggestedQueriesContentItem, TableContentItem, TextContentItem, ThinkingContentItem, ToolResultContentItem, ToolUseContentItem. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when setting `actual_instance` in MessageContentItem with oneOf schemas: ChartContentItem, SuggestedQueriesContentItem, TableContentItem, TextContentItem, ThinkingContentItem, ToolResultContentItem, ToolUseContentItem. Details: " + ", ".join(error_messages))
-        else:
-            return v
+        return MESSAGECONTENTITEM_REGISTRY.validate(v)
 
     @classmethod
     def from_dict(cls, obj: Union[str, Dict[str, Any]]) -> Self:
-        return cls.from_json(json.dumps(obj))
+        """Returns the object represented by the already parsed dict"""
+        if isinstance(obj, str):
+            return cls.from_json(obj)
+        return MESSAGECONTENTITEM_REGISTRY.construct(cls, obj)
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Returns the object represented by the json string"""
-        instance = cls.model_construct()
-        error_messages = []
-        match = 0
-
-        # use oneOf discriminator to lookup the data type
-        _data_type = json.loads(json_str).get("type")
-        if not _data_type:
-            raise ValueError("Failed to lookup data type from the field `type` in the input.")
-
-        # check if data type is `ChartContentItem`
-        if _data_type == "chart":
-            instance.actual_instance = ChartContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `SuggestedQueriesContentItem`
-        if _data_type == "suggested_queries":
-            instance.actual_instance = SuggestedQueriesContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `TableContentItem`
-        if _data_type == "table":
-            instance.actual_instance = TableContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `TextContentItem`
-        if _data_type == "text":
-            instance.actual_instance = TextContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingContentItem`
-        if _data_type == "thinking":
-            instance.actual_instance = ThinkingContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultContentItem`
-        if _data_type == "tool_result":
-            instance.actual_instance = ToolResultContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolUseContentItem`
-        if _data_type == "tool_use":
-            instance.actual_instance = ToolUseContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ChartContentItem`
-        if _data_type == "ChartContentItem":
-            instance.actual_instance = ChartContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `SuggestedQueriesContentItem`
-        if _data_type == "SuggestedQueriesContentItem":
-            instance.actual_instance = SuggestedQueriesContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `TableContentItem`
-        if _data_type == "TableContentItem":
-            instance.actual_instance = TableContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `TextContentItem`
-        if _data_type == "TextContentItem":
-            instance.actual_instance = TextContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingContentItem`
-        if _data_type == "ThinkingContentItem":
-            instance.actual_instance = ThinkingContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultContentItem`
-        if _data_type == "ToolResultContentItem":
-            instance.actual_instance = ToolResultContentItem.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolUseContentItem`
-        if _data_type == "ToolUseContentItem":
-            instance.actual_instance = ToolUseContentItem.from_json(json_str)
-            return instance
-
-        # deserialize data into TextContentItem
-        try:
-            instance.actual_instance = TextContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ThinkingContentItem
-        try:
-            instance.actual_instance = ThinkingContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolUseContentItem
-        try:
-            instance.actual_instance = ToolUseContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolResultContentItem
-        try:
-            instance.actual_instance = ToolResultContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into TableContentItem
-        try:
-            instance.actual_instance = TableContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ChartContentItem
-        try:
-            instance.actual_instance = ChartContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into SuggestedQueriesContentItem
-        try:
-            instance.actual_instance = SuggestedQueriesContentItem.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when deserializing the JSON string into MessageContentItem with oneOf schemas: ChartContentItem, SuggestedQueriesContentItem, TableContentItem, TextContentItem, ThinkingContentItem, ToolResultContentItem, ToolUseContentItem. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when deserializing the JSON string into MessageContentItem with oneOf schemas: ChartContentItem, SuggestedQueriesContentItem, TableContentItem, TextContentItem, ThinkingContentItem, ToolResultContentItem, ToolUseContentItem. Details: " + ", ".join(error_messages))
-        else:
-            return instance
+        return cls.from_dict(json.loads(json_str))
 
     def to_json(self) -> str:
         """Returns the JSON representation of the actual instance"""
@@ -284,3 +115,12 @@ class MessageContentItem(BaseModel):
         return pprint.pformat(self.model_dump())
 
 
+MESSAGECONTENTITEM_REGISTRY = OneOfRegistry("MessageContentItem", "type", {
+    "chart": ChartContentItem,
+    "suggested_queries": SuggestedQueriesContentItem,
+    "table": TableContentItem,
+    "text": TextContentItem,
+    "thinking": ThinkingContentItem,
+    "tool_result": ToolResultContentItem,
+    "tool_use": ToolUseContentItem,
+})
@@ -0,0 +1,76 @@
+# coding: utf-8
+
+"""
+    Cortex Agent REST API
+
+    Discriminator lookup shared by the oneOf wrapper models.
+"""  # noqa: E501
+
+
+from __future__ import annotations
+from typing import Any, Dict, Optional, Type
+from pydantic import BaseModel
+
+
+class OneOfRegistry:
+    """
+    Compiled discriminator table for one oneOf wrapper model.
+
+    Every discriminator value, and every schema name, maps straight to its
+    concrete class, so decoding is one dict lookup on an already parsed
+    object and validating `actual_instance` is one type check. Input without
+    the discriminator is matched on required keys rather than by trying to
+    deserialize every schema.
+    """
+
+    def __init__(self, name: str, discriminator: str, mapping: Dict[str, Type[BaseModel]]) -> None:
+        self.name = name
+        self.discriminator = discriminator
+        self.classes: Dict[str, Type[BaseModel]] = dict(mapping)
+        for _cls in mapping.values():
+            self.classes.setdefault(_cls.__name__, _cls)
+        self.types = frozenset(mapping.values())
+        # required keys of each schema, to resolve input without a discriminator
+        self.required_keys = [
+            (frozenset(_field.alias or _name for _name, _field in _cls.model_fields.items() if _field.is_required()), _cls)
+            for _cls in self.types
+        ]
+        self.schemas = ", ".join(sorted(_cls.__name__ for _cls in self.types))
+        # empty wrapper instance, copied instead of deep-copying field defaults
+        self._empty: Optional[BaseModel] = None
+
+    def lookup(self, obj: Dict[str, Any]) -> Type[BaseModel]:
+        """Returns the concrete class for a parsed object"""
+        _data_type = obj.get(self.discriminator)
+        if not _data_type:
+            # e.g. citations, whose discriminator isn't a model field and so
+            # is dropped by `to_dict`: pick the only schema whose required
+            # keys are all present
+            _matches = [_cls for _keys, _cls in self.required_keys if _keys <= obj.keys()]
+            if len(_matches) != 1:
+                raise ValueError(f"Failed to lookup data type from the field `{self.discriminator}` in the input.")
+            return _matches[0]
+        _cls = self.classes.get(_data_type)
+        if _cls is None:
+            raise ValueError(f"No match found when deserializing the JSON string into {self.name} with oneOf schemas: {self.schemas}. Details: unknown discriminator value `{_data_type}`")
+        return _cls
+
+    def construct(self, wrapper_cls: Type[BaseModel], obj: Dict[str, Any]) -> Any:
+        """Returns a `wrapper_cls` holding the concrete instance decoded from `obj`"""
+        _instance = self.lookup(obj).from_dict(obj)
+        if self._empty is None:
+            self._empty = wrapper_cls.model_construct()
+        # the concrete class is one of the oneOf schemas by construction, so
+        # skip re-running the `actual_instance` validator
+        return self._empty.model_copy(update={"actual_instance": _instance})
+
+    def validate(self, v: Any) -> Any:
+        """Validates a value assigned to `actual_instance`"""
+        if type(v) in self.types:
+            return v
+        match = sum(1 for _cls in self.types if isinstance(v, _cls))
+        if match > 1:
+            raise ValueError(f"Multiple matches found when setting `actual_instance` in {self.name} with oneOf schemas: {self.schemas}. Details: Input type `{type(v)}` matches more than one schema")
+        elif match == 0:
+            raise ValueError(f"No match found when setting `actual_instance` in {self.name} with oneOf schemas: {self.schemas}. Details: Input type `{type(v)}` is not one of the schemas")
+        return v
@@ -33,6 +33,7 @@ class ResponseEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["role", "content"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
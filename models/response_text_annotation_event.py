@@ -40,6 +40,7 @@ class ResponseTextAnnotationEvent(BaseModel):
         return value
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -34,6 +34,7 @@ class ResponseTextAnnotationEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "annotation_index", "annotation"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -34,6 +34,7 @@ class ResultSet(BaseModel):
     __properties: ClassVar[List[str]] = ["statementHandle", "resultSetMetaData", "data"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -35,6 +35,7 @@ class ResultSetMetaData(BaseModel):
     __properties: ClassVar[List[str]] = ["partition", "numRows", "format", "rowType"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -36,6 +36,7 @@ class RowType(BaseModel):
     __properties: ClassVar[List[str]] = ["name", "type", "length", "precision", "scale", "nullable"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
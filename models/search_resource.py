@@ -38,6 +38,7 @@ class SearchResource(BaseModel):
     __properties: ClassVar[List[str]] = ["search_service", "name", "max_results", "title_column", "id_column", "filter", "experimental"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -18,6 +18,7 @@ import json
 import pprint
 from pydantic import BaseModel, ConfigDict, Field, StrictStr, ValidationError, field_validator
 from typing import Any, List, Optional
+from models.one_of_registry import OneOfRegistry
 from models.analyst_tool_result_delta_event import AnalystToolResultDeltaEvent
 from models.chart_event import ChartEvent
 from models.error_event import ErrorEvent
@@ -34,11 +35,30 @@ from models.tool_result_event import ToolResultEvent
 from models.tool_result_status_event import ToolResultStatusEvent
 from models.tool_use_event import ToolUseEvent
 from pydantic import StrictStr, Field
-from typing import Union, List, Set, Optional, Dict
+from typing import Union, List, Set, Optional, Dict, Type
 from typing_extensions import Literal, Self
 
 SERVERSENTEVENT_ONE_OF_SCHEMAS = ["AnalystToolResultDeltaEvent", "ChartEvent", "ErrorEvent", "ResponseEvent", "ResponseTextAnnotationEvent", "StatusEvent", "SuggestedQueriesEvent", "TableEvent", "TextDeltaEvent", "TextEvent", "ThinkingDeltaEvent", "ThinkingEvent", "ToolResultEvent", "ToolResultStatusEvent", "ToolUseEvent"]
 
+# discriminator value to concrete event class
+SERVERSENTEVENT_DISCRIMINATOR_MAP: Dict[str, Type[BaseModel]] = {
+    "error": ErrorEvent,
+    "response": ResponseEvent,
+    "response.chart": ChartEvent,
+    "response.status": StatusEvent,
+    "response.suggested_queries": SuggestedQueriesEvent,
+    "response.table": TableEvent,
+    "response.text": TextEvent,
+    "response.text.annotation": ResponseTextAnnotationEvent,
+    "response.text.delta": TextDeltaEvent,
+    "response.thinking": ThinkingEvent,
+    "response.thinking.delta": ThinkingDeltaEvent,
+    "response.tool_result": ToolResultEvent,
+    "response.tool_result.analyst.delta": AnalystToolResultDeltaEvent,
+    "response.tool_result.status": ToolResultStatusEvent,
+    "response.tool_use": ToolUseEvent,
+}
+
 class ServerSentEvent(BaseModel):
     """
     ServerSentEvent
@@ -77,6 +97,7 @@ class ServerSentEvent(BaseModel):
     one_of_schemas: Set[str] = { "AnalystToolResultDeltaEvent", "ChartEvent", "ErrorEvent", "ResponseEvent", "ResponseTextAnnotationEvent", "StatusEvent", "SuggestedQueriesEvent", "TableEvent", "TextDeltaEvent", "TextEvent", "ThinkingDeltaEvent", "ThinkingEvent", "ToolResultEvent", "ToolResultStatusEvent", "ToolUseEvent" }
 
     model_config = ConfigDict(
+        defer_build=True,
         validate_assignment=True,
         protected_namespaces=(),
     )
@@ -97,358 +118,31 @@ class ServerSentEvent(BaseModel):
 
     @field_validator('actual_instance')
     def actual_instance_must_validate_oneof(cls, v):
-        instance = ServerSentEvent.model_construct()
-        error_messages = []
-        match = 0
-        # validate data type: ResponseEvent
-        if not isinstance(v, ResponseEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ResponseEvent`")
-        else:
-            match += 1
-        # validate data type: TextEvent
-        if not isinstance(v, TextEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `TextEvent`")
-        else:
-            match += 1
-        # validate data type: TextDeltaEvent
-        if not isinstance(v, TextDeltaEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `TextDeltaEvent`")
-        else:
-            match += 1
-        # validate data type: ResponseTextAnnotationEvent
-        if not isinstance(v, ResponseTextAnnotationEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ResponseTextAnnotationEvent`")
-        else:
-            match += 1
-        # validate data type: ThinkingEvent
-        if not isinstance(v, ThinkingEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ThinkingEvent`")
-        else:
-            match += 1
-        # validate data type: ThinkingDeltaEvent
-        if not isinstance(v, ThinkingDeltaEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ThinkingDeltaEvent`")
-        else:
-            match += 1
-        # validate data type: ToolUseEvent
-        if not isinstance(v, ToolUseEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolUseEvent`")
-        else:
-            match += 1
-        # validate data type: ToolResultEvent
-        if not isinstance(v, ToolResultEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolResultEvent`")
-        else:
-            match += 1
-        # validate data type: ToolResultStatusEvent
-        if not isinstance(v, ToolResultStatusEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolResultStatusEvent`")
-        else:
-            match += 1
-        # validate data type: AnalystToolResultDeltaEvent
-        if not isinstance(v, AnalystToolResultDeltaEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `AnalystToolResultDeltaEvent`")
-        else:
-            match += 1
-        # validate data type: TableEvent
-        if not isinstance(v, TableEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `TableEvent`")
-        else:
-            match += 1
-        # validate data type: ChartEvent
-        if not isinstance(v, ChartEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ChartEvent`")
-        else:
-            match += 1
-        # validate data type: StatusEvent
-        if not isinstance(v, StatusEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `StatusEvent`")
-        else:
-            match += 1
-        # validate data type: SuggestedQueriesEvent
-        if not isinstance(v, SuggestedQueriesEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `SuggestedQueriesEvent`")
-        else:
-            match += 1
-        # validate data type: ErrorEvent
-        if not isinstance(v, ErrorEvent):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ErrorEvent`")
-        else:
-            match += 1
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when setting `actual_instance` in ServerSentEvent with oneOf schemas: AnalystToolResultDeltaEvent, ChartEvent, ErrorEvent, ResponseEvent, ResponseTextAnnotationEvent, StatusEvent, SuggestedQueriesEvent, TableEvent, TextDeltaEvent, TextEvent, ThinkingDeltaEvent, ThinkingEvent, ToolResultEvent, ToolResultStatusEvent, ToolUseEvent. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when setting `actual_instance` in ServerSentEvent with oneOf schemas: AnalystToolResultDeltaEvent, ChartEvent, ErrorEvent, ResponseEvent, ResponseTextAnnotationEvent, StatusEvent, SuggestedQueriesEvent, TableEvent, TextDeltaEvent, TextEvent, ThinkingDeltaEvent, ThinkingEvent, ToolResultEvent, ToolResultStatusEvent, ToolUseEvent. Details: " + ", ".join(error_messages))
-        else:
-            return v
+        return SERVERSENTEVENT_REGISTRY.validate(v)
 
     @classmethod
     def from_dict(cls, obj: Union[str, Dict[str, Any]]) -> Self:
-        return cls.from_json(json.dumps(obj))
+        """Returns the object represented by the already parsed dict"""
+        if isinstance(obj, str):
+            return cls.from_json(obj)
+        return SERVERSENTEVENT_REGISTRY.construct(cls, obj)
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Returns the object represented by the json string"""
-        instance = cls.model_construct()
-        error_messages = []
-        match = 0
-
-        # use oneOf discriminator to lookup the data type
-        _data_type = json.loads(json_str).get("event")
-        if not _data_type:
-            raise ValueError("Failed to lookup data type from the field `event` in the input.")
-
-        # check if data type is `ErrorEvent`
-        if _data_type == "error":
-            instance.actual_instance = ErrorEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ResponseEvent`
-        if _data_type == "response":
-            instance.actual_instance = ResponseEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ChartEvent`
-        if _data_type == "response.chart":
-            instance.actual_instance = ChartEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `StatusEvent`
-        if _data_type == "response.status":
-            instance.actual_instance = StatusEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `SuggestedQueriesEvent`
-        if _data_type == "response.suggested_queries":
-            instance.actual_instance = SuggestedQueriesEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TableEvent`
-        if _data_type == "response.table":
-            instance.actual_instance = TableEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TextEvent`
-        if _data_type == "response.text":
-            instance.actual_instance = TextEvent.from_json(json_str)
-            return instance
+        return cls.from_dict(json.loads(json_str))
 
-        # check if data type is `ResponseTextAnnotationEvent`
-        if _data_type == "response.text.annotation":
-            instance.actual_instance = ResponseTextAnnotationEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TextDeltaEvent`
-        if _data_type == "response.text.delta":
-            instance.actual_instance = TextDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingEvent`
-        if _data_type == "response.thinking":
-            instance.actual_instance = ThinkingEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingDeltaEvent`
-        if _data_type == "response.thinking.delta":
-            instance.actual_instance = ThinkingDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultEvent`
-        if _data_type == "response.tool_result":
-            instance.actual_instance = ToolResultEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `AnalystToolResultDeltaEvent`
-        if _data_type == "response.tool_result.analyst.delta":
-            instance.actual_instance = AnalystToolResultDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultStatusEvent`
-        if _data_type == "response.tool_result.status":
-            instance.actual_instance = ToolResultStatusEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolUseEvent`
-        if _data_type == "response.tool_use":
-            instance.actual_instance = ToolUseEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `AnalystToolResultDeltaEvent`
-        if _data_type == "AnalystToolResultDeltaEvent":
-            instance.actual_instance = AnalystToolResultDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ChartEvent`
-        if _data_type == "ChartEvent":
-            instance.actual_instance = ChartEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ErrorEvent`
-        if _data_type == "ErrorEvent":
-            instance.actual_instance = ErrorEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ResponseEvent`
-        if _data_type == "ResponseEvent":
-            instance.actual_instance = ResponseEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ResponseTextAnnotationEvent`
-        if _data_type == "ResponseTextAnnotationEvent":
-            instance.actual_instance = ResponseTextAnnotationEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `StatusEvent`
-        if _data_type == "StatusEvent":
-            instance.actual_instance = StatusEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `SuggestedQueriesEvent`
-        if _data_type == "SuggestedQueriesEvent":
-            instance.actual_instance = SuggestedQueriesEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TableEvent`
-        if _data_type == "TableEvent":
-            instance.actual_instance = TableEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TextDeltaEvent`
-        if _data_type == "TextDeltaEvent":
-            instance.actual_instance = TextDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `TextEvent`
-        if _data_type == "TextEvent":
-            instance.actual_instance = TextEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingDeltaEvent`
-        if _data_type == "ThinkingDeltaEvent":
-            instance.actual_instance = ThinkingDeltaEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ThinkingEvent`
-        if _data_type == "ThinkingEvent":
-            instance.actual_instance = ThinkingEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultEvent`
-        if _data_type == "ToolResultEvent":
-            instance.actual_instance = ToolResultEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultStatusEvent`
-        if _data_type == "ToolResultStatusEvent":
-            instance.actual_instance = ToolResultStatusEvent.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolUseEvent`
-        if _data_type == "ToolUseEvent":
-            instance.actual_instance = ToolUseEvent.from_json(json_str)
-            return instance
-
-        # deserialize data into ResponseEvent
-        try:
-            instance.actual_instance = ResponseEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into TextEvent
-        try:
-            instance.actual_instance = TextEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into TextDeltaEvent
-        try:
-            instance.actual_instance = TextDeltaEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ResponseTextAnnotationEvent
-        try:
-            instance.actual_instance = ResponseTextAnnotationEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ThinkingEvent
-        try:
-            instance.actual_instance = ThinkingEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ThinkingDeltaEvent
-        try:
-            instance.actual_instance = ThinkingDeltaEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolUseEvent
-        try:
-            instance.actual_instance = ToolUseEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolResultEvent
-        try:
-            instance.actual_instance = ToolResultEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolResultStatusEvent
-        try:
-            instance.actual_instance = ToolResultStatusEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into AnalystToolResultDeltaEvent
-        try:
-            instance.actual_instance = AnalystToolResultDeltaEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into TableEvent
-        try:
-            instance.actual_instance = TableEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ChartEvent
-        try:
-            instance.actual_instance = ChartEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into StatusEvent
-        try:
-            instance.actual_instance = StatusEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into SuggestedQueriesEvent
-        try:
-            instance.actual_instance = SuggestedQueriesEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ErrorEvent
-        try:
-            instance.actual_instance = ErrorEvent.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
+    @classmethod
+    def from_event(cls, event: str, data: Union[str, bytes, Dict[str, Any]]) -> Self:
+        """Returns the object represented by a single SSE frame.
 
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when deserializing the JSON string into ServerSentEvent with oneOf schemas: AnalystToolResultDeltaEvent, ChartEvent, ErrorEvent, ResponseEvent, ResponseTextAnnotationEvent, StatusEvent, SuggestedQueriesEvent, TableEvent, TextDeltaEvent, TextEvent, ThinkingDeltaEvent, ThinkingEvent, ToolResultEvent, ToolResultStatusEvent, ToolUseEvent. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when deserializing the JSON string into ServerSentEvent with oneOf schemas: AnalystToolResultDeltaEvent, ChartEvent, ErrorEvent, ResponseEvent, ResponseTextAnnotationEvent, StatusEvent, SuggestedQueriesEvent, TableEvent, TextDeltaEvent, TextEvent, ThinkingDeltaEvent, ThinkingEvent, ToolResultEvent, ToolResultStatusEvent, ToolUseEvent. Details: " + ", ".join(error_messages))
-        else:
-            return instance
+        On the wire the discriminator is carried by the `event:` field and the
+        payload by the `data:` field, so the payload is parsed exactly once here
+        and wrapped in the `{"event": ..., "data": ...}` envelope.
+        """
+        if not isinstance(data, dict):
+            data = json.loads(data)
+        return cls.from_dict({"event": event, "data": data})
 
     def to_json(self) -> str:
         """Returns the JSON representation of the actual instance"""
@@ -476,3 +170,4 @@ class ServerSentEvent(BaseModel):
         return pprint.pformat(self.model_dump())
 
 
+SERVERSENTEVENT_REGISTRY = OneOfRegistry("ServerSentEvent", "event", SERVERSENTEVENT_DISCRIMINATOR_MAP)
@@ -31,6 +31,7 @@ class SuggestedQuery(BaseModel):
     __properties: ClassVar[List[str]] = ["query"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
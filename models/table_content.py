@@ -35,6 +35,7 @@ class TableContent(BaseModel):
     __properties: ClassVar[List[str]] = ["tool_use_id", "query_id", "result_set", "title"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
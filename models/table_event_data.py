@@ -36,6 +36,7 @@ class TableEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "tool_use_id", "query_id", "result_set", "title"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -34,6 +34,7 @@ class TextContent(BaseModel):
     __properties: ClassVar[List[str]] = ["text", "annotations", "is_elicitation"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
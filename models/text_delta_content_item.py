@@ -32,6 +32,7 @@ class TextDeltaContentItem(BaseModel):
     __properties: ClassVar[List[str]] = ["text", "is_elicitation"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
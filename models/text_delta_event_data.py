@@ -33,6 +33,7 @@ class TextDeltaEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "text", "is_elicitation"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -35,6 +35,7 @@ class TextEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "text", "annotations", "is_elicitation"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
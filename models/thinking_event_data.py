@@ -32,6 +32,7 @@ class ThinkingEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "text"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
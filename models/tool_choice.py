@@ -32,6 +32,7 @@ class ToolChoice(BaseModel):
     __properties: ClassVar[List[str]] = ["type", "name"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -36,6 +36,7 @@ class ToolResult(BaseModel):
     __properties: ClassVar[List[str]] = ["tool_use_id", "type", "name", "content", "status"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -18,6 +18,7 @@ import json
 import pprint
 from pydantic import BaseModel, ConfigDict, Field, StrictStr, ValidationError, field_validator
 from typing import Any, List, Optional
+from models.one_of_registry import OneOfRegistry
 from models.tool_result_content_json import ToolResultContentJSON
 from models.tool_result_content_text import ToolResultContentText
 from pydantic import StrictStr, Field
@@ -38,6 +39,7 @@ class ToolResultContent(BaseModel):
     one_of_schemas: Set[str] = { "ToolResultContentJSON", "ToolResultContentText" }
 
     model_config = ConfigDict(
+        defer_build=True,
         validate_assignment=True,
         protected_namespaces=(),
     )
@@ -58,85 +60,19 @@ class ToolResultContent(BaseModel):
 
     @field_validator('actual_instance')
     def actual_instance_must_validate_oneof(cls, v):
-        instance = ToolResultContent.model_construct()
-        error_messages = []
-        match = 0
-        # validate data type: ToolResultContentText
-        if not isinstance(v, ToolResultContentText):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolResultContentText`")
-        else:
-            match += 1
-        # validate data type: ToolResultContentJSON
-        if not isinstance(v, ToolResultContentJSON):
-            error_messages.append(f"Error! Input type `{type(v)}` is not `ToolResultContentJSON`")
-        else:
-            match += 1
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when setting `actual_instance` in ToolResultContent with oneOf schemas: ToolResultContentJSON, ToolResultContentText. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when setting `actual_instance` in ToolResultContent with oneOf schemas: ToolResultContentJSON, ToolResultContentText. Details: " + ", ".join(error_messages))
-        else:
-            return v
+        return TOOLRESULTCONTENT_REGISTRY.validate(v)
 
     @classmethod
     def from_dict(cls, obj: Union[str, Dict[str, Any]]) -> Self:
-        return cls.from_json(json.dumps(obj))
+        """Returns the object represented by the already parsed dict"""
+        if isinstance(obj, str):
+            return cls.from_json(obj)
+        return TOOLRESULTCONTENT_REGISTRY.construct(cls, obj)
 
     @classmethod
     def from_json(cls, json_str: str) -> Self:
         """Returns the object represented by the json string"""
-        instance = cls.model_construct()
-        error_messages = []
-        match = 0
-
-        # use oneOf discriminator to lookup the data type
-        _data_type = json.loads(json_str).get("type")
-        if not _data_type:
-            raise ValueError("Failed to lookup data type from the field `type` in the input.")
-
-        # check if data type is `ToolResultContentJSON`
-        if _data_type == "json":
-            instance.actual_instance = ToolResultContentJSON.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultContentText`
-        if _data_type == "text":
-            instance.actual_instance = ToolResultContentText.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultContentJSON`
-        if _data_type == "ToolResultContentJSON":
-            instance.actual_instance = ToolResultContentJSON.from_json(json_str)
-            return instance
-
-        # check if data type is `ToolResultContentText`
-        if _data_type == "ToolResultContentText":
-            instance.actual_instance = ToolResultContentText.from_json(json_str)
-            return instance
-
-        # deserialize data into ToolResultContentText
-        try:
-            instance.actual_instance = ToolResultContentText.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-        # deserialize data into ToolResultContentJSON
-        try:
-            instance.actual_instance = ToolResultContentJSON.from_json(json_str)
-            match += 1
-        except (ValidationError, ValueError) as e:
-            error_messages.append(str(e))
-
-        if match > 1:
-            # more than 1 match
-            raise ValueError("Multiple matches found when deserializing the JSON string into ToolResultContent with oneOf schemas: ToolResultContentJSON, ToolResultContentText. Details: " + ", ".join(error_messages))
-        elif match == 0:
-            # no match
-            raise ValueError("No match found when deserializing the JSON string into ToolResultContent with oneOf schemas: ToolResultContentJSON, ToolResultContentText. Details: " + ", ".join(error_messages))
-        else:
-            return instance
+        return cls.from_dict(json.loads(json_str))
 
     def to_json(self) -> str:
         """Returns the JSON representation of the actual instance"""
@@ -164,3 +100,7 @@ class ToolResultContent(BaseModel):
         return pprint.pformat(self.model_dump())
 
 
+TOOLRESULTCONTENT_REGISTRY = OneOfRegistry("ToolResultContent", "type", {
+    "json": ToolResultContentJSON,
+    "text": ToolResultContentText,
+})
@@ -37,6 +37,7 @@ class ToolResultEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "tool_use_id", "type", "name", "content", "status"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -35,6 +35,7 @@ class ToolToolSpec(BaseModel):
     __properties: ClassVar[List[str]] = ["type", "name", "description", "input_schema"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
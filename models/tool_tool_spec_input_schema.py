@@ -34,6 +34,7 @@ class ToolToolSpecInputSchema(BaseModel):
     __properties: ClassVar[List[str]] = ["type", "properties", "required"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
@@ -34,6 +34,7 @@ class ToolUse(BaseModel):
     __properties: ClassVar[List[str]] = ["tool_use_id", "type", "name", "input"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
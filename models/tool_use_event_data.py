@@ -35,6 +35,7 @@ class ToolUseEventData(BaseModel):
     __properties: ClassVar[List[str]] = ["content_index", "tool_use_id", "type", "name", "input"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
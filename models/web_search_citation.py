@@ -34,6 +34,7 @@ class WebSearchCitation(BaseModel):
     __properties: ClassVar[List[str]] = ["start_index", "end_index", "source_url", "text"]
 
     model_config = ConfigDict(
+        defer_build=True,
         populate_by_name=True,
         validate_assignment=True,
         protected_namespaces=(),
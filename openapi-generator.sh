@@ -22,6 +22,14 @@ docker run \
   --skip-operation-example \
   --additional-properties=useOneOfDiscriminatorLookup=true
 
-rsync -r --include "*" pyclient.build/openapi_client/models .
+# models/__init__.py imports lazily and is maintained by hand
+rsync -r --exclude "__init__.py" pyclient.build/openapi_client/models .
 rm -rf pyclient.build
 find ./models -type f -name "*.py" -exec sed -i '' 's|from openapi_client.models.|from models.|g' {} +
+# Re-apply the changes made to the generated models, in order. Regenerate a
+# patch with `git diff` when the generator output it applies to changes.
+for patch in openapi-patches/*.patch; do
+  patch -s -p1 --no-backup-if-mismatch < "${patch}"
+done
+# Build pydantic schemas on first use instead of at import
+find ./models -type f -name "*.py" -exec perl -pi -e 's/^(\s*)model_config = ConfigDict\($/$&\n$1    defer_build=True,/' {} +
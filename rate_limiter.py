@@ -0,0 +1,335 @@
+import asyncio
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, Hashable, Mapping, Optional
+
+
+class TokenBucket:
+    """Token bucket shared by threads and event loops alike.
+
+    Tokens refill at `rate` per second up to `burst`. `reserve` always
+    succeeds and returns how long the caller has to wait for its token, so
+    waiters are served in the order they arrived without polling.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            rate: Tokens added per second.
+            burst: Bucket size, defaults to one second worth of tokens.
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` and returns the seconds to wait before using them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+# Statuses that mean the service is overloaded and the run may be retried
+OVERLOAD_STATUSES = frozenset([429, 503, 504])
+
+
+class Permit:
+    """One admitted run; hand it back to `AdaptiveLimiter.release` exactly once."""
+
+    __slots__ = ("session", "epoch", "released")
+
+    def __init__(self, session: Hashable, epoch: int) -> None:
+        self.session = session
+        self.epoch = epoch
+        self.released = False
+
+
+class _Waiter:
+    __slots__ = ("event", "future", "loop", "permit")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+        self.permit: Optional[Permit] = None
+
+    def wake(self, permit: Permit) -> None:
+        self.permit = permit
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(_resolve, self.future)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit plus token bucket, shared by every session.
+
+    Each admitted run holds a `Permit` until its stream is finished. The
+    concurrency limit grows by `increase` per limit-worth of successful runs
+    and is multiplied by `decrease` when the service reports overload (429,
+    503 or 504), at most once per generation of in-flight runs so a burst
+    of rejections doesn't collapse it. A `Retry-After` pauses admissions for
+    everyone until it has passed.
+
+    Waiting runs are queued per session and admitted round-robin across
+    sessions, so one session firing many runs can't starve the others.
+    Works from threads (`acquire`) and event loops (`acquire_async`).
+    """
+
+    def __init__(
+        self,
+        initial: float = 8,
+        min_concurrency: float = 1,
+        max_concurrency: float = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            initial: Starting concurrency limit.
+            min_concurrency: The limit never drops below this.
+            max_concurrency: The limit never grows above this.
+            increase: Added to the limit per limit-worth of successes.
+            decrease: Factor applied to the limit on overload.
+            rate: Optional cap on runs started per second, see `TokenBucket`.
+            burst: Token bucket size.
+        """
+        self.limit = float(initial)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease = decrease
+        self.bucket = TokenBucket(rate, burst, clock) if rate else None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._epoch = 0
+        self._paused_until = 0.0
+        self._queues: "OrderedDict[Hashable, Deque[_Waiter]]" = OrderedDict()
+        self.successes = 0
+        self.overloads = 0
+
+    def acquire(self, session: Hashable = None) -> Permit:
+        """Blocks until a run of `session` may start."""
+        waiter = _Waiter()
+        permit = self._enqueue(session, waiter)
+        if permit is None:
+            waiter.event.wait()
+            permit = waiter.permit
+        delay = self._admission_delay()
+        if delay:
+            time.sleep(delay)
+        return permit
+
+    async def acquire_async(self, session: Hashable = None) -> Permit:
+        waiter = _Waiter(asyncio.get_running_loop())
+        permit = self._enqueue(session, waiter)
+        if permit is None:
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                self._cancel(session, waiter)
+                raise
+            permit = waiter.permit
+        delay = self._admission_delay()
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                self.release(permit)
+                raise
+        return permit
+
+    def release(
+        self,
+        permit: Permit,
+        status: Optional[int] = None,
+        retry_after: Optional[float] = None,
+    ) -> None:
+        """Returns a permit with the HTTP status of its run.
+
+        Pass `None` for a run that never got a status or whose stream failed
+        after the headers; it counts neither as a success nor as overload.
+        """
+        with self._lock:
+            if permit.released:
+                return
+            permit.released = True
+            self._in_flight -= 1
+            if status in OVERLOAD_STATUSES:
+                self.overloads += 1
+                if permit.epoch == self._epoch:
+                    self.limit = max(self.min_concurrency, self.limit * self.decrease)
+                    self._epoch += 1
+                if retry_after:
+                    self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            elif status is not None and status < 400:
+                self.successes += 1
+                self.limit = min(self.max_concurrency, self.limit + self.increase / self.limit)
+            self._wake_next()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Current limits and counters, e.g. for a status page or log line."""
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": sum(len(queue) for queue in self._queues.values()),
+                "queued_sessions": len(self._queues),
+                "paused_for": max(0.0, self._paused_until - self._clock()),
+                "rate": self.bucket.rate if self.bucket else None,
+                "successes": self.successes,
+                "overloads": self.overloads,
+            }
+
+    def _enqueue(self, session: Hashable, waiter: _Waiter) -> Optional[Permit]:
+        with self._lock:
+            if not self._queues and self._in_flight < int(self.limit):
+                return self._admit(session)
+            self._queues.setdefault(session, deque()).append(waiter)
+            return None
+
+    def _cancel(self, session: Hashable, waiter: _Waiter) -> None:
+        with self._lock:
+            queue = self._queues.get(session)
+            if queue is not None and waiter in queue:
+                queue.remove(waiter)
+                if not queue:
+                    del self._queues[session]
+                return
+        # Admitted before the cancellation landed
+        if waiter.permit is not None:
+            self.release(waiter.permit)
+
+    def _admit(self, session: Hashable) -> Permit:
+        self._in_flight += 1
+        return Permit(session, self._epoch)
+
+    def _wake_next(self) -> None:
+        # Round-robin: the session served goes to the back of the line
+        while self._queues and self._in_flight < int(self.limit):
+            session, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(session)
+            else:
+                del self._queues[session]
+            waiter.wake(self._admit(session))
+
+    def _admission_delay(self) -> float:
+        delay = max(0.0, self._paused_until - self._clock())
+        if self.bucket is not None:
+            delay = max(delay, self.bucket.reserve())
+        return delay
+
+
+class RetryPolicy:
+    """Admission and retries of run requests, shared by both clients.
+
+    A run is admitted through the optional `limiter` and holds its permit
+    until its stream has been read. A run rejected with 429, 503 or 504 is
+    retried up to `max_retries` times, after `Retry-After` or a jittered
+    backoff; other statuses fail at once.
+
+        for attempt in policy.attempts():
+            permit = policy.acquire(session)
+            resp = send()
+            if resp.status < 400:
+                ...  # stream, then policy.release(permit, resp.status)
+            delay = policy.rejected(permit, resp.status, resp.headers, attempt)
+            if delay is None:
+                raise ...
+            time.sleep(delay)
+    """
+
+    def __init__(self, limiter: Optional[AdaptiveLimiter] = None, max_retries: int = 2) -> None:
+        """
+        Args:
+            limiter: Admits runs, shared with every other client using it.
+            max_retries: Retries of a run rejected with an overload status.
+        """
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def attempts(self) -> range:
+        return range(self.max_retries + 1)
+
+    def acquire(self, session: Hashable = None) -> Optional[Permit]:
+        return self.limiter.acquire(session) if self.limiter is not None else None
+
+    async def acquire_async(self, session: Hashable = None) -> Optional[Permit]:
+        return await self.limiter.acquire_async(session) if self.limiter is not None else None
+
+    def release(self, permit: Optional[Permit], status: Optional[int] = None) -> None:
+        """Returns the permit of a run, see `AdaptiveLimiter.release`; no-op without one."""
+        if permit is not None:
+            self.limiter.release(permit, status)
+
+    def rejected(
+        self,
+        permit: Optional[Permit],
+        status: int,
+        headers: Mapping[str, str],
+        attempt: int,
+    ) -> Optional[float]:
+        """Releases the permit of a run rejected with `status`.
+
+        Returns the seconds to wait before the next attempt, or `None` when
+        the run should fail.
+        """
+        delay = retry_after(headers)
+        if permit is not None:
+            self.limiter.release(permit, status, delay)
+        if status not in OVERLOAD_STATUSES or attempt == self.max_retries:
+            return None
+        if self.limiter is not None and delay is not None:
+            # The limiter waits out Retry-After itself before admitting again
+            return 0.0
+        return backoff(attempt) if delay is None else delay
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds from a `Retry-After` header; HTTP dates are not supported."""
+    value = headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def backoff(attempt: int, base: float = 0.5, cap: float = 30.0) -> float:
+    """Full-jitter exponential backoff, as the API docs recommend for 503/504."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,55 @@
+"""Optional `Content-Encoding` for large run request bodies.
+
+A history with a few table results is mostly repeated JSON keys and result
+set strings, which compress several times over. `gzip` uses the standard library;
+`zstd` compresses faster at a similar ratio but needs the optional
+`zstandard` package. Only enable an encoding the endpoint (and any proxy in
+front of it) accepts; `benchmarks/bench_request_compression.py` shows when
+the CPU time pays for itself.
+"""
+
+import gzip
+from typing import Dict, Optional, Tuple
+
+ENCODINGS = ("gzip", "zstd")
+
+# Bodies smaller than this are sent as is
+DEFAULT_THRESHOLD = 64 * 1024
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError("zstd request compression requires the `zstandard` package") from e
+    return zstandard
+
+
+def compress(body: bytes, encoding: str, level: Optional[int] = None) -> bytes:
+    if encoding == "gzip":
+        # Higher levels barely shrink result sets further but cost 4x+ the CPU;
+        # mtime=0 keeps the output deterministic
+        return gzip.compress(body, compresslevel=1 if level is None else level, mtime=0)
+    if encoding == "zstd":
+        return _zstandard().ZstdCompressor(level=3 if level is None else level).compress(body)
+    raise ValueError(f"Unsupported content encoding {encoding!r}, expected one of {ENCODINGS}")
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "zstd":
+        return _zstandard().ZstdDecompressor().decompressobj().decompress(body)
+    raise ValueError(f"Unsupported content encoding {encoding!r}, expected one of {ENCODINGS}")
+
+
+def encode_body(
+    body: bytes,
+    encoding: Optional[str],
+    threshold: int = DEFAULT_THRESHOLD,
+    level: Optional[int] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Returns the body to send and the headers to add for it."""
+    if encoding is None or len(body) < threshold:
+        return body, {}
+    return compress(body, encoding, level), {"Content-Encoding": encoding}
@@ -0,0 +1,72 @@
+"""Single-pass JSON encoding of the generated request models.
+
+The generated `to_json` dumps every model to a dict with pydantic, rebuilds
+the nested parts through the hand-written `to_dict` overrides and only then
+calls `json.dumps`. `dumps` instead hands the model itself to the encoder,
+which asks `_default` for one shallow dict per model as it goes, so no
+intermediate tree of the whole request is ever built.
+
+The output is compact UTF-8 and matches `json.loads(model.to_json())`:
+aliases are used, `None` fields are left out, `additional_properties` are
+inlined and oneOf wrappers serialize as their `actual_instance`. With the
+optional `orjson` installed the encoding itself runs in native code too.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Model class to its (attribute, JSON key) pairs, `None` for oneOf wrappers
+_PLANS: Dict[type, Optional[List[Tuple[str, str]]]] = {}
+
+
+def _plan(cls: type) -> Optional[List[Tuple[str, str]]]:
+    fields = cls.model_fields
+    if "actual_instance" in fields:
+        plan = None
+    else:
+        plan = [
+            (name, field.alias or name)
+            for name, field in fields.items()
+            if name != "additional_properties"
+        ]
+    _PLANS[cls] = plan
+    return plan
+
+
+def _default(obj: Any) -> Any:
+    if not isinstance(obj, BaseModel):
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    cls = type(obj)
+    plan = _PLANS[cls] if cls in _PLANS else _plan(cls)
+    if plan is None:
+        return obj.actual_instance
+    values = obj.__dict__
+    out = {}
+    for name, key in plan:
+        value = values[name]
+        if value is not None:
+            if type(value) is not list and isinstance(value, list):
+                # `json` iterates list subclasses through `__iter__`, which
+                # would decode every item of a `LazyContent`
+                value = list.copy(value)
+            out[key] = value
+    extra = values.get("additional_properties")
+    if extra:
+        out.update(extra)
+    return out
+
+
+def dumps(model: BaseModel) -> bytes:
+    """Returns the compact UTF-8 JSON of a generated model."""
+    if orjson is not None:
+        return orjson.dumps(model, default=_default)
+    return json.dumps(
+        model, default=_default, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
@@ -0,0 +1,185 @@
+"""Opt-in client-side cache of complete agent runs.
+
+A run is keyed on a hash of the endpoint (which carries the agent identity,
+`DATABASE`/`SCHEMA`/`AGENT`) and the normalized request: message history,
+`tool_choice` and every other field that can change the answer. The value
+is the run's SSE stream, so a hit is replayed through the same decoding and
+rendering code as a live response.
+
+Only runs that carry their whole history are cached. A threaded run
+(`thread_id` set) depends on server-side state the key can't see, and
+replaying it would not record the turn in the thread.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from models import DataAgentRunRequest, LiteAgentRunRequest
+from sse_decoder import SSEFrame, iter_sse
+
+RunRequest = Union[DataAgentRunRequest, LiteAgentRunRequest]
+
+_WHITESPACE = re.compile(r"\s+")
+# Events that only make sense for the run that produced them
+_UNCACHED_EVENTS = frozenset(["metadata"])
+
+
+class MemoryCache:
+    """In-process LRU backend, shared by every session of the process."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache:
+    """Local disk backend, survives restarts and can be shared by processes."""
+
+    def __init__(self, path: str, max_entries: int = 4096) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " expires REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now),
+            )
+            # Expired entries go first, then the least recently used
+            self._db.execute("DELETE FROM responses WHERE expires <= ?", (now,))
+            self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses"
+                " ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class ResponseCache:
+    """Stores finished runs in a backend (`MemoryCache` by default) for `ttl` seconds."""
+
+    def __init__(self, backend: Any = None, ttl: float = 3600.0) -> None:
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cacheable(request: RunRequest) -> bool:
+        return request.thread_id is None
+
+    @staticmethod
+    def key(path: str, request: RunRequest) -> str:
+        """Hash of the endpoint and the normalized request."""
+        body = request.to_dict()
+        body["messages"] = [_normalize(message) for message in body.get("messages", [])]
+        canonical = json.dumps(
+            {"path": path, "request": body}, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Returns the cached SSE stream for `key`, if any."""
+        body = self.backend.get(key)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def put(self, key: str, frames: Iterable[SSEFrame]) -> bool:
+        """Caches a run's frames if it completed without an error."""
+        stream = bytearray()
+        complete = False
+        for event, data in frames:
+            if event == "error":
+                return False
+            if event in _UNCACHED_EVENTS:
+                continue
+            complete = complete or event == "response"
+            stream += _encode_frame(event, data)
+        if complete:
+            self.backend.set(key, bytes(stream), self.ttl)
+        return complete
+
+    def put_stream(self, key: str, chunks: Iterable[bytes]) -> bool:
+        """Caches a run from its raw response chunks."""
+        return self.put(key, iter_sse(chunks))
+
+
+def _normalize(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Collapses whitespace in user text; never mutates `message`."""
+    if message.get("role") != "user":
+        return message
+    content = [
+        {**item, "text": _WHITESPACE.sub(" ", item["text"]).strip()}
+        if item.get("type") == "text"
+        else item
+        for item in message.get("content", [])
+    ]
+    return {**message, "content": content}
+
+
+def _encode_frame(event: str, data: str) -> bytes:
+    # Multi-line payloads need one `data:` field per line
+    data = data.replace("\n", "\ndata: ")
+    return f"event: {event}\ndata: {data}\n\n".encode("utf-8")
@@ -0,0 +1,193 @@
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from models import ResultSet, RowType
+
+# Largest FIXED precision that always fits in an int64
+_INT64_PRECISION = 18
+# Largest FIXED precision a float64 holds without rounding
+_FLOAT64_PRECISION = 15
+# Timestamps whose epoch values are UTC; TIMESTAMP_NTZ is wall-clock time
+_UTC_TIMESTAMPS = frozenset(["TIMESTAMP_LTZ", "TIMESTAMP_TZ"])
+
+
+def to_columns(result_set: ResultSet) -> List[np.ma.MaskedArray]:
+    """Converts the row-major string data into one typed array per column.
+
+    Values are decoded according to `rowType` in a single pass over each
+    column, and SQL NULLs are masked. FIXED without a scale maps to int64,
+    or to an object array of Python ints when a value doesn't fit; with a
+    scale it maps to float64 up to 15 digits of precision and to an object
+    array of `Decimal`s beyond. REAL maps to float64, BOOLEAN to bool, DATE
+    and TIMESTAMP_* to datetime64[ns] (UTC for LTZ and TZ, wall-clock time
+    for NTZ), TIME to timedelta64[ns] and anything else stays a string in
+    an object array.
+    """
+    row_type = result_set.result_set_meta_data.row_type
+    # One C-level pass to a 2-D object array, each column is then a view
+    table = np.array(result_set.data, dtype=object).reshape(-1, len(row_type))
+    return [_convert(col_type, table[:, i]) for i, col_type in enumerate(row_type)]
+
+
+def to_dataframe(result_set: ResultSet) -> pd.DataFrame:
+    """Converts the result set to a DataFrame with native column dtypes.
+
+    Integer and boolean columns containing NULLs use pandas' nullable
+    `Int64` and `boolean` dtypes, numbers that don't fit those exactly are
+    `object` columns of `int`/`Decimal` (see `to_columns`). TIMESTAMP_LTZ
+    and TIMESTAMP_TZ columns are UTC, TIMESTAMP_NTZ stays time zone naive.
+    """
+    row_type = result_set.result_set_meta_data.row_type
+    series = [
+        _to_series(col_type, column)
+        for col_type, column in zip(row_type, to_columns(result_set))
+    ]
+    frame = pd.concat(series, axis=1) if series else pd.DataFrame()
+    # Assigned afterwards so duplicate column names survive
+    frame.columns = [col.name for col in row_type]
+    return frame
+
+
+def to_arrow(result_set: ResultSet):
+    """Converts the result set to a `pyarrow.Table`.
+
+    Requires the optional `pyarrow` dependency.
+    """
+    import pyarrow as pa
+
+    row_type = result_set.result_set_meta_data.row_type
+    arrays = []
+    for col_type, column in zip(row_type, to_columns(result_set)):
+        mask = np.ma.getmaskarray(column)
+        values = column.data
+        if _base_type(col_type) in _UTC_TIMESTAMPS:
+            arrays.append(pa.array(values, mask=mask, type=pa.timestamp("ns", tz="UTC")))
+        elif _base_type(col_type).startswith("TIMESTAMP"):
+            arrays.append(pa.array(values, mask=mask, type=pa.timestamp("ns")))
+        elif _base_type(col_type) == "FIXED" and values.dtype == object:
+            decimals = [None if null else Decimal(value) for value, null in zip(values, mask)]
+            arrays.append(pa.array(decimals, type=pa.decimal128(col_type.precision, col_type.scale)))
+        elif _base_type(col_type) == "DATE":
+            arrays.append(pa.array(values.astype("datetime64[D]"), mask=mask))
+        elif values.dtype == object:
+            arrays.append(pa.array(values, mask=mask, type=pa.string()))
+        else:
+            arrays.append(pa.array(values, mask=mask))
+    return pa.Table.from_arrays(arrays, names=[col.name for col in row_type])
+
+
+def _base_type(col_type: RowType) -> str:
+    return col_type.type.upper()
+
+
+def _to_series(col_type: RowType, column: np.ma.MaskedArray) -> pd.Series:
+    mask = np.ma.getmaskarray(column)
+    values = column.data
+    if values.dtype == np.int64 and mask.any():
+        return pd.Series(pd.arrays.IntegerArray(values, mask))
+    if values.dtype == np.bool_ and mask.any():
+        return pd.Series(pd.arrays.BooleanArray(values, mask))
+    if values.dtype.kind in "mMO" and mask.any():
+        values = values.copy()
+        values[mask] = None if values.dtype == object else values.dtype.type("NaT")
+    if _base_type(col_type) in _UTC_TIMESTAMPS:
+        return pd.Series(values).dt.tz_localize("UTC")
+    return pd.Series(values)
+
+
+def _convert(col_type: RowType, values: np.ndarray) -> np.ma.MaskedArray:
+    mask = values == None  # noqa: E711 - elementwise comparison
+    base = _base_type(col_type)
+    if base == "FIXED" and col_type.scale == 0:
+        converter = _to_int if col_type.precision <= _INT64_PRECISION else _to_big_int
+    elif base == "FIXED" and col_type.precision > _FLOAT64_PRECISION:
+        converter = _to_decimal
+    else:
+        converter = _CONVERTERS.get(base)
+    if converter is None:
+        return np.ma.MaskedArray(values, mask=mask)
+    if not len(values):
+        # Convert a placeholder to get the column dtype
+        return np.ma.MaskedArray(converter(np.array([converter.null], dtype=object))[:0])
+    if mask.any():
+        values = values.copy()
+        values[mask] = converter.null
+    return np.ma.MaskedArray(converter(values), mask=mask)
+
+
+def _to_int(values: np.ndarray) -> np.ndarray:
+    return values.astype(np.int64)
+
+
+def _to_big_int(values: np.ndarray) -> np.ndarray:
+    # NUMBER(38, 0) is the default for integer columns and aggregates, but
+    # its values mostly fit an int64 anyway
+    try:
+        return values.astype(np.int64)
+    except OverflowError:
+        return _objects(int(value) for value in values)
+
+
+def _to_decimal(values: np.ndarray) -> np.ndarray:
+    return _objects(Decimal(value) for value in values)
+
+
+def _objects(values) -> np.ndarray:
+    # np.array would coerce the objects to a numeric dtype where it can
+    return np.fromiter(values, dtype=object)
+
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+    return values.astype(np.float64)
+
+
+def _to_bool(values: np.ndarray) -> np.ndarray:
+    return np.isin(np.char.lower(values.astype(str)), ("true", "1"))
+
+
+def _to_date(values: np.ndarray) -> np.ndarray:
+    # Days since the epoch
+    return values.astype(np.int64).astype("datetime64[D]").astype("datetime64[ns]")
+
+
+def _epoch_nanos(values: np.ndarray) -> np.ndarray:
+    # "<seconds>.<fraction>", parsed exactly rather than through float64
+    seconds, _, fraction = np.char.partition(values.astype(str), ".").T
+    nanos = np.char.ljust(fraction, 9, "0").astype(np.int64)
+    nanos[np.char.startswith(seconds, "-")] *= -1
+    return seconds.astype(np.int64) * 1_000_000_000 + nanos
+
+
+def _to_timestamp(values: np.ndarray) -> np.ndarray:
+    # TIMESTAMP_TZ appends " <offset minutes + 1440>" to the UTC epoch value
+    values = np.char.partition(values.astype(str), " ")[:, 0]
+    return _epoch_nanos(values).astype("datetime64[ns]")
+
+
+def _to_time(values: np.ndarray) -> np.ndarray:
+    # Seconds since midnight
+    return _epoch_nanos(values).astype("timedelta64[ns]")
+
+
+_to_int.null = "0"
+_to_big_int.null = "0"
+_to_decimal.null = "0"
+_to_float.null = "nan"
+_to_bool.null = "false"
+_to_date.null = "0"
+_to_timestamp.null = "0"
+_to_time.null = "0"
+
+_CONVERTERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "FIXED": _to_float,
+    "REAL": _to_float,
+    "BOOLEAN": _to_bool,
+    "DATE": _to_date,
+    "TIMESTAMP_LTZ": _to_timestamp,
+    "TIMESTAMP_NTZ": _to_timestamp,
+    "TIMESTAMP_TZ": _to_timestamp,
+    "TIME": _to_time,
+}
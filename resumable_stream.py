@@ -0,0 +1,168 @@
+import contextlib
+import time
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Tuple, Type
+
+import requests
+
+from rate_limiter import backoff
+from sse_decoder import SSEFrame, iter_sse
+
+# Events after which the run is over
+TERMINAL_EVENTS = frozenset(["response", "error"])
+# Yielded when a rerun differs from what was already yielded of the run
+RESET_EVENT = "response.reset"
+
+
+class StreamInterrupted(Exception):
+    """The stream ended early more than `max_reconnects` times."""
+
+
+class ResumableStream:
+    """SSE frames of one run that survive dropped connections.
+
+    The `:run` endpoints have no resume cursor, so on a disconnect (or a
+    stream that ends before its `response` or `error` event) the same
+    request is issued again through `connect`. That reruns the whole run,
+    which only replays the frames already yielded if the agent answers the
+    same way again:
+
+    * while the new attempt repeats the frames already yielded byte for
+      byte they are skipped, so the stream continues where it broke off,
+    * as soon as it differs, a `RESET_EVENT` frame (with `{}` as data) is
+      yielded and the new attempt is passed on from its start.
+
+    On a reset consumers drop everything they rendered of the run, partial
+    and completed items alike, and draw the frames that follow. With a
+    thread, pass the same `thread_id`/`parent_message_id` request again so
+    the retried turn replaces the interrupted one instead of following it.
+
+        response = client.data_agent_run(db, schema, agent, request)
+        connect = lambda: client.data_agent_run(db, schema, agent, request).iter_content(None)
+        for event, data in ResumableStream(connect, response.iter_content(None)):
+            if event == RESET_EVENT:
+                clear()
+            ...
+    """
+
+    def __init__(
+        self,
+        connect: Optional[Callable[[], Iterable[bytes]]],
+        chunks: Optional[Iterable[bytes]] = None,
+        max_reconnects: int = 3,
+        retry_on: Tuple[Type[BaseException], ...] = (requests.RequestException, OSError),
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Args:
+            connect: Issues the run request and returns its raw chunks.
+            chunks: Chunks of an already issued first attempt, if any.
+            max_reconnects: Give up with `StreamInterrupted` after this many.
+            retry_on: Exceptions raised while connecting or reading that mean
+                a disconnect.
+            sleep: Called with a jittered backoff before each reconnect.
+        """
+        self.connect = connect
+        self.chunks = chunks
+        self.max_reconnects = max_reconnects
+        self.retry_on = retry_on
+        self.sleep = sleep
+        self.reconnects = 0
+        # Reruns that differed from what was yielded before
+        self.resets = 0
+        # Hashes of the frames yielded since the start or the last reset
+        self._yielded: List[int] = []
+
+    def __iter__(self) -> Iterator[SSEFrame]:
+        first = [self.chunks] if self.chunks is not None else []
+
+        def frames() -> Iterator[SSEFrame]:
+            return iter_sse(first.pop() if first else self.connect())
+
+        return self.resume(frames)
+
+    def resume(self, frames: Callable[[], Iterable[SSEFrame]]) -> Iterator[SSEFrame]:
+        """Yields the de-duplicated frames of the attempts `frames` returns.
+
+        `frames` is called for the first attempt and again after each
+        disconnect; `connect` is not used.
+        """
+        while True:
+            dedupe = self.attempt()
+            try:
+                # A failed (re)connect counts as an interrupted attempt too
+                for event, data in frames():
+                    yield from dedupe(event, data)
+                    if event in TERMINAL_EVENTS:
+                        return
+            except self.retry_on:
+                pass
+            self._interrupted()
+            self.sleep(backoff(self.reconnects))
+            self.reconnects += 1
+
+    async def resume_async(self, frames: Callable[[], AsyncIterator[SSEFrame]]) -> AsyncIterator[SSEFrame]:
+        """Like `resume` for an event loop, which backs off with `asyncio.sleep`."""
+        # Imported here so the synchronous clients don't pay for asyncio
+        import asyncio
+
+        while True:
+            dedupe = self.attempt()
+            try:
+                async with contextlib.aclosing(frames()) as attempt:
+                    async for event, data in attempt:
+                        for frame in dedupe(event, data):
+                            yield frame
+                        if event in TERMINAL_EVENTS:
+                            return
+            except self.retry_on:
+                pass
+            self._interrupted()
+            await asyncio.sleep(backoff(self.reconnects))
+            self.reconnects += 1
+
+    def attempt(self) -> Callable[[str, str], List[SSEFrame]]:
+        """Returns the filter for the frames of a new attempt.
+
+        It returns the frames to pass on for each frame of the attempt:
+        none while it replays what was already yielded, and a reset frame
+        followed by the attempt's frames so far once it differs. Lets code
+        that reads the stream itself, like an event loop, share the
+        de-duplication; `connect` is not used then.
+        """
+        return _Attempt(self)
+
+    def _interrupted(self) -> None:
+        if self.reconnects == self.max_reconnects:
+            raise StreamInterrupted(
+                f"Stream interrupted {self.reconnects + 1} times, giving up"
+            )
+
+
+class _Attempt:
+    """Filter of the frames of one attempt, see `ResumableStream.attempt`."""
+
+    def __init__(self, stream: ResumableStream) -> None:
+        self._stream = stream
+        # Frames of this attempt matching the yielded ones so far, None once
+        # the attempt caught up or differed
+        self._replayed: Optional[List[SSEFrame]] = [] if stream._yielded else None
+
+    def __call__(self, event: str, data: str) -> List[SSEFrame]:
+        frame = (event, data)
+        # Compared by hash so a long run isn't kept in memory twice
+        digest = hash(frame)
+        stream = self._stream
+        replayed = self._replayed
+        if replayed is None:
+            stream._yielded.append(digest)
+            return [frame]
+        if stream._yielded[len(replayed)] == digest:
+            replayed.append(frame)
+            if len(replayed) == len(stream._yielded):
+                self._replayed = None
+            return []
+        self._replayed = None
+        stream.resets += 1
+        frames = replayed + [frame]
+        stream._yielded = [hash(frame) for frame in frames]
+        return [(RESET_EVENT, "{}")] + frames
@@ -0,0 +1,54 @@
+"""Command line arguments and run requests shared by `batch_runner` and `agent_cli`.
+
+Kept apart from both so the CLI doesn't import aiohttp through the batch
+runner just for its arguments.
+"""
+
+import argparse
+import json
+import os
+from typing import Any, Dict, Union
+
+from models import DataAgentRunRequest, LiteAgentRunRequest, Message, ToolChoice
+
+
+def add_connection_args(parser: argparse.ArgumentParser) -> None:
+    """Adds the host, token, agent and request field arguments."""
+    parser.add_argument("--host", required=True)
+    parser.add_argument("--token", default=os.environ.get("SNOWFLAKE_PAT"))
+    parser.add_argument("--scheme", default="https")
+    parser.add_argument("--insecure", action="store_true", help="skip TLS verification")
+    parser.add_argument("--database")
+    parser.add_argument("--schema")
+    parser.add_argument("--agent")
+    parser.add_argument("--request", help="JSON file with the other run request fields")
+    parser.add_argument("--tool-choice", help="tool_choice JSON, e.g. '{\"type\": \"required\"}'")
+
+
+def load_request_fields(parser: argparse.ArgumentParser, args: argparse.Namespace) -> Dict[str, Any]:
+    """Checks the arguments of `add_connection_args` and returns the request fields.
+
+    Exits through `parser.error` when they don't go together.
+    """
+    if args.agent and not (args.database and args.schema):
+        parser.error("--agent needs --database and --schema")
+    if not args.token:
+        parser.error("pass --token or set SNOWFLAKE_PAT")
+    request_fields: Dict[str, Any] = {}
+    if args.request:
+        with open(args.request, encoding="utf-8") as f:
+            request_fields = json.load(f)
+    if args.tool_choice:
+        request_fields["tool_choice"] = ToolChoice.from_json(args.tool_choice).to_dict()
+    return request_fields
+
+
+def build_request(
+    question: str, request_fields: Dict[str, Any], data_agent: bool
+) -> Union[DataAgentRunRequest, LiteAgentRunRequest]:
+    """A single-turn run request for `question`, for an agent object if `data_agent`."""
+    message = Message.from_dict({"role": "user", "content": [{"type": "text", "text": question}]})
+    fields = {**request_fields, "messages": [message.to_dict()]}
+    if data_agent:
+        return DataAgentRunRequest.from_dict(fields)
+    return LiteAgentRunRequest.from_dict(fields)
@@ -0,0 +1,274 @@
+"""Process-wide scheduling of agent runs for many concurrent sessions.
+
+Without it every Streamlit session blocks its script thread on its own
+run, holds a pooled connection plus a reader thread for the whole stream,
+and nothing bounds how many runs the process has in flight. A `RunManager`
+instead owns one `AsyncAgentClient` (and so one connection pool) driven
+by a single event loop on a worker thread. Sessions submit runs and get a
+`RunHandle` back, whose bounded queue they iterate for the SSE frames:
+
+    manager = RunManager(AsyncAgentClient(host, token))
+    handle = manager.submit_data_agent_run(db, schema, agent, request, session=session_id)
+    for event, data in handle:
+        render(event, data)
+
+Admission goes through the client's `AdaptiveLimiter`, which caps the runs
+in flight for the whole process and admits waiting runs round-robin across
+sessions. On top of that each session has at most `max_runs_per_session`
+runs streaming and the manager refuses new runs with `RunRejected` once
+`max_pending` are queued or streaming. Dropped connections are retried and
+de-duplicated like `ResumableStream` does, including its `RESET_EVENT`.
+"""
+
+import asyncio
+import concurrent.futures
+import contextlib
+import itertools
+import queue
+import threading
+from collections import defaultdict
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, Iterator, Mapping, Optional, Union
+
+import aiohttp
+
+from async_agent_client import AsyncAgentClient
+from event_pipeline import DONE, coalesce, iter_batches
+from models import DataAgentRunRequest, LiteAgentRunRequest
+from rate_limiter import AdaptiveLimiter
+from resumable_stream import ResumableStream
+from sse_decoder import SSEFrame
+
+# Errors of a run's stream that mean the connection dropped
+_DISCONNECTS = (aiohttp.ClientPayloadError, aiohttp.ServerDisconnectedError, ConnectionError, asyncio.TimeoutError)
+
+
+class RunRejected(Exception):
+    """The manager has `max_pending` runs already, or was closed."""
+
+
+class RunHandle:
+    """One submitted run, consumed from the thread that renders it.
+
+    Iterate it for the run's `(event, data)` frames; errors of the run are
+    raised from the iterator. Frames piled up while the consumer was busy
+    come out as one batch, with consecutive text and thinking deltas merged
+    as in `EventPipeline`. At most `maxsize` frames are buffered, after
+    which the run stops reading its stream until the consumer catches up.
+    Leaving the loop early cancels the run.
+    """
+
+    def __init__(
+        self, run_id: int, session: Hashable, loop: asyncio.AbstractEventLoop, maxsize: int, coalesce: bool
+    ) -> None:
+        self.run_id = run_id
+        self.session = session
+        self.coalesce = coalesce
+        self.status = "queued"
+        self._loop = loop
+        self._queue: "queue.Queue" = queue.Queue()
+        # Created on the loop by `RunManager._start`
+        self._credits: Optional[asyncio.Semaphore] = None
+        self._maxsize = maxsize
+        self._headers: Mapping[str, str] = {}
+        self._started = threading.Event()
+        self._task: Optional["asyncio.Future"] = None
+
+    def headers(self, timeout: Optional[float] = None) -> Mapping[str, str]:
+        """Blocks until the response headers arrive; empty if the run failed first."""
+        self._started.wait(timeout)
+        return self._headers
+
+    @property
+    def request_id(self) -> Optional[str]:
+        return self._headers.get("X-Snowflake-Request-Id")
+
+    def __iter__(self) -> Iterator[SSEFrame]:
+        try:
+            for batch in iter_batches(self._queue):
+                if batch:
+                    # Let the run read as many frames again
+                    self._loop.call_soon_threadsafe(self._release, len(batch))
+                yield from (coalesce(batch) if self.coalesce else batch)
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """Stops the run; frames not consumed yet are dropped."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    def _release(self, count: int) -> None:
+        for _ in range(count):
+            self._credits.release()
+
+    async def _put(self, frame: SSEFrame) -> None:
+        await self._credits.acquire()
+        self._queue.put(frame)
+
+    def _set_headers(self, headers: Mapping[str, str]) -> None:
+        self._headers = dict(headers)
+        self.status = "running"
+        self._started.set()
+
+    def _finish(self, end: Union[object, BaseException], status: str) -> None:
+        self.status = status
+        self._started.set()
+        self._queue.put(end)
+
+
+class RunManager:
+    """Runs agent requests of every session on one event loop; see the module docstring."""
+
+    def __init__(
+        self,
+        client: AsyncAgentClient,
+        max_concurrency: int = 64,
+        max_runs_per_session: int = 2,
+        max_pending: int = 1000,
+        queue_size: int = 256,
+        coalesce: bool = True,
+        max_reconnects: int = 3,
+    ) -> None:
+        """
+        Args:
+            client: Owned by the manager from now on and closed with it. Without
+                a limiter it gets an `AdaptiveLimiter` capped at `max_concurrency`.
+            max_concurrency: Cap on runs streaming at once, for the default limiter.
+            max_runs_per_session: Further runs of a session wait for one of its
+                runs to finish, without taking a slot in the limiter meanwhile.
+            max_pending: Runs queued or streaming before `submit` raises `RunRejected`.
+            queue_size: Frames buffered per run before its stream stops being read.
+            coalesce: Merge consecutive text and thinking deltas for slow consumers.
+            max_reconnects: Reconnects of a dropped stream before giving up.
+        """
+        if client.retry.limiter is None:
+            client.retry.limiter = AdaptiveLimiter(
+                initial=min(8, max_concurrency), max_concurrency=max_concurrency
+            )
+        self.client = client
+        self.max_runs_per_session = max_runs_per_session
+        self.max_pending = max_pending
+        self.queue_size = queue_size
+        self.coalesce = coalesce
+        self.max_reconnects = max_reconnects
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._runs: Dict[int, RunHandle] = {}
+        self._closed = False
+        # Per session run slots and runs holding or waiting for one, only
+        # touched on the loop
+        self._session_slots: Dict[Hashable, asyncio.Semaphore] = {}
+        self._session_runs: Dict[Hashable, int] = defaultdict(int)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="run-manager", daemon=True)
+        self._thread.start()
+
+    def submit_data_agent_run(
+        self,
+        database: str,
+        schema: str,
+        agent: str,
+        request: DataAgentRunRequest,
+        session: Hashable = None,
+    ) -> RunHandle:
+        """Queues a `dataAgentRun` of `session` and returns its handle."""
+        return self._submit(
+            session,
+            lambda on_headers: self.client.data_agent_run(
+                database, schema, agent, request, session, raw=True, on_headers=on_headers
+            ),
+        )
+
+    def submit_agent_run(self, request: LiteAgentRunRequest, session: Hashable = None) -> RunHandle:
+        """Queues an `agentRun` of `session` and returns its handle."""
+        return self._submit(
+            session,
+            lambda on_headers: self.client.agent_run(request, session, raw=True, on_headers=on_headers),
+        )
+
+    def create_thread(self, origin_application: str = "", timeout: Optional[float] = None) -> int:
+        """Creates a conversation thread through the manager's client, blocking."""
+        future = asyncio.run_coroutine_threadsafe(
+            self.client.create_thread(origin_application), self._loop
+        )
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def metrics(self) -> Dict[str, Any]:
+        """Runs by status and session plus the limiter's metrics."""
+        with self._lock:
+            runs = list(self._runs.values())
+        statuses: Dict[str, int] = defaultdict(int)
+        for handle in runs:
+            statuses[handle.status] += 1
+        return {
+            "runs": len(runs),
+            "statuses": dict(statuses),
+            "sessions": len({handle.session for handle in runs}),
+            "limiter": self.client.retry.limiter.metrics(),
+        }
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Cancels every run, closes the client and stops the loop."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            runs = list(self._runs.values())
+        for handle in runs:
+            handle.cancel()
+        asyncio.run_coroutine_threadsafe(self.client.close(), self._loop).result(timeout)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+    def _submit(
+        self, session: Hashable, connect: Callable[[Callable[[Mapping[str, str]], None]], AsyncIterator[SSEFrame]]
+    ) -> RunHandle:
+        with self._lock:
+            if self._closed:
+                raise RunRejected("Run manager is closed")
+            if len(self._runs) >= self.max_pending:
+                raise RunRejected(f"{len(self._runs)} runs pending, try again later")
+            handle = RunHandle(next(self._ids), session, self._loop, self.queue_size, self.coalesce)
+            self._runs[handle.run_id] = handle
+        handle._task = asyncio.run_coroutine_threadsafe(self._start(handle, connect), self._loop)
+        handle._task.add_done_callback(lambda _: self._forget(handle))
+        return handle
+
+    def _forget(self, handle: RunHandle) -> None:
+        if handle.status in ("queued", "running"):
+            # Cancelled before it started
+            handle._finish(DONE, "cancelled")
+        with self._lock:
+            self._runs.pop(handle.run_id, None)
+
+    async def _start(self, handle: RunHandle, connect) -> None:
+        session = handle.session
+        handle._credits = asyncio.Semaphore(handle._maxsize)
+        if session not in self._session_slots:
+            self._session_slots[session] = asyncio.Semaphore(self.max_runs_per_session)
+        self._session_runs[session] += 1
+        try:
+            async with self._session_slots[session]:
+                await self._stream(handle, connect)
+        except asyncio.CancelledError:
+            handle._finish(DONE, "cancelled")
+        except Exception as e:
+            handle._finish(e, "error")
+        else:
+            handle._finish(DONE, "done")
+        finally:
+            self._session_runs[session] -= 1
+            if not self._session_runs[session]:
+                del self._session_runs[session]
+                del self._session_slots[session]
+
+    async def _stream(self, handle: RunHandle, connect) -> None:
+        resumable = ResumableStream(None, max_reconnects=self.max_reconnects, retry_on=_DISCONNECTS)
+        frames = resumable.resume_async(lambda: connect(handle._set_headers))
+        async with contextlib.aclosing(frames):
+            async for frame in frames:
+                await handle._put(frame)
@@ -0,0 +1,174 @@
+"""Per-stage latency of agent runs.
+
+A `RunTimer` is started right before the run request is sent, told about
+the response headers and wrapped around the stream of SSE frames:
+
+    timer = RunTimer()
+    response = client.data_agent_run(db, schema, agent, request)
+    timer.headers(response.headers)
+    for event, data in timer.wrap(iter_sse(response.iter_content(chunk_size=None))):
+        render(event, data)
+
+When the stream ends, the run's record is stored in `TIMINGS` under its
+`X-Snowflake-Request-Id` and logged as one JSON line on the `run_timing`
+logger. All times are seconds since the request was sent:
+
+    time_to_headers       response headers received
+    time_to_first_status  first `response.status`
+    time_to_first_text    first `response.text.delta`
+    total                 last frame consumed
+    network               time spent waiting for frames
+    render                time spent by the consumer between frames
+    tools                 per tool use: `start` (`response.tool_use`), `end`
+                          (`response.tool_result`), `duration` and the
+                          `response.tool_result.status` transitions
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from sse_decoder import SSEFrame
+
+logger = logging.getLogger(__name__)
+
+
+class TimingRegistry:
+    """The most recent `max_records` run records, by request id."""
+
+    def __init__(self, max_records: int = 1000) -> None:
+        self.max_records = max_records
+        self._records: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._records[record["request_id"]] = record
+            self._records.move_to_end(record["request_id"])
+            while len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+
+    def get(self, request_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._records.get(request_id)
+
+    def recent(self, count: int = 20) -> List[Dict[str, Any]]:
+        """The last `count` records, newest first."""
+        with self._lock:
+            return list(reversed(self._records.values()))[:count]
+
+
+TIMINGS = TimingRegistry()
+
+
+class RunTimer:
+    """Collects the timing record of one run; see the module docstring."""
+
+    def __init__(
+        self,
+        registry: Optional[TimingRegistry] = TIMINGS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.registry = registry
+        self._clock = clock
+        self._start = clock()
+        self.request_id: Optional[str] = None
+        self.record: Dict[str, Any] = {
+            "request_id": None,
+            "started_at": time.time(),
+            "time_to_headers": None,
+            "time_to_first_status": None,
+            "time_to_first_text": None,
+            "total": None,
+            "network": 0.0,
+            "render": 0.0,
+            "events": 0,
+            "error": None,
+            "tools": [],
+        }
+        self._tools: Dict[str, Dict[str, Any]] = {}
+        self._finished = False
+
+    def elapsed(self) -> float:
+        return round(self._clock() - self._start, 6)
+
+    def headers(self, headers: Mapping[str, str]) -> None:
+        """Records the response headers of the run request."""
+        self.record["time_to_headers"] = self.elapsed()
+        self.request_id = headers.get("X-Snowflake-Request-Id")
+        self.record["request_id"] = self.request_id
+
+    def observe(self, event: str, data: str) -> None:
+        """Records one frame as it arrives."""
+        record = self.record
+        record["events"] += 1
+        if event == "response.text.delta":
+            if record["time_to_first_text"] is None:
+                record["time_to_first_text"] = self.elapsed()
+        elif event == "response.status":
+            if record["time_to_first_status"] is None:
+                record["time_to_first_status"] = self.elapsed()
+        elif event == "response.tool_use":
+            payload = json.loads(data)
+            tool = {
+                "tool_use_id": payload.get("tool_use_id"),
+                "type": payload.get("type"),
+                "name": payload.get("name"),
+                "start": self.elapsed(),
+                "end": None,
+                "duration": None,
+                "statuses": [],
+            }
+            self._tools[tool["tool_use_id"]] = tool
+            record["tools"].append(tool)
+        elif event == "response.tool_result.status":
+            payload = json.loads(data)
+            tool = self._tools.get(payload.get("tool_use_id"))
+            if tool is not None:
+                tool["statuses"].append({"status": payload.get("status"), "at": self.elapsed()})
+        elif event == "response.tool_result":
+            payload = json.loads(data)
+            tool = self._tools.get(payload.get("tool_use_id"))
+            if tool is not None:
+                tool["end"] = self.elapsed()
+                tool["duration"] = round(tool["end"] - tool["start"], 6)
+        elif event == "error":
+            record["error"] = json.loads(data)
+
+    def wrap(self, frames: Iterable[SSEFrame]) -> Iterator[SSEFrame]:
+        """Passes frames through, timing them and the consumer in between."""
+        clock = self._clock
+        record = self.record
+        iterator = iter(frames)
+        try:
+            while True:
+                waiting = clock()
+                try:
+                    frame = next(iterator)
+                except StopIteration:
+                    return
+                received = clock()
+                record["network"] += received - waiting
+                self.observe(*frame)
+                yield frame
+                record["render"] += clock() - received
+        finally:
+            self.finish()
+
+    def finish(self) -> Dict[str, Any]:
+        """Closes the record, stores it in the registry and logs it."""
+        if not self._finished:
+            self._finished = True
+            record = self.record
+            record["total"] = self.elapsed()
+            record["network"] = round(record["network"], 6)
+            record["render"] = round(record["render"], 6)
+            if record["request_id"] is None:
+                record["request_id"] = f"local-{id(self):x}"
+            if self.registry is not None:
+                self.registry.add(record)
+            logger.info("run timing %s", json.dumps(record))
+        return self.record
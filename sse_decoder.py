@@ -0,0 +1,126 @@
+from typing import AsyncIterable, AsyncIterator, Iterable, Iterator, List, Optional, Tuple
+
+# (event, data) pair for one complete SSE frame
+SSEFrame = Tuple[str, str]
+
+
+class SSEDecoder:
+    """Incremental decoder for a `text/event-stream` byte stream.
+
+    Raw chunks are appended to one `bytearray` and scanned in place; field
+    values are referenced by offset and only the `data` of a complete frame is
+    copied out (once) and decoded. Frames may be split at any byte, and
+    multi-line `data:` fields are joined with `\\n` as the spec requires.
+    Lines may end in `\\n` or `\\r\\n`.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        # Start of the first line not parsed yet
+        self._pos = 0
+        # Where to resume looking for a newline in a partial line
+        self._scan = 0
+        self._event: Optional[str] = None
+        self._data: List[Tuple[int, int]] = []
+        self.last_event_id: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> List[SSEFrame]:
+        """Adds a chunk and returns the frames it completed."""
+        buf = self._buf
+        buf += chunk
+        frames: List[SSEFrame] = []
+        # Hot loop state is kept in locals and written back at the end
+        pos, scan, event, data = self._pos, self._scan, self._event, self._data
+        # Everything before the frame being parsed can be dropped
+        frame_start = data[0][0] if data else pos
+        find = buf.find
+        startswith = buf.startswith
+        with memoryview(buf) as view:
+            while True:
+                if not data and event is None:
+                    # Fast path for the common `event: x\ndata: y\n\n` frame.
+                    # No newline exists between `pos` and `scan`, so the
+                    # search never rescans a long partial line.
+                    end = find(b"\n\n", max(pos, scan - 1))
+                    if end >= 0 and find(b"\r", pos, end) < 0:
+                        line = pos
+                        if startswith(b"event: ", pos):
+                            line = find(b"\n", pos, end)
+                            event = str(view[pos + 7 : line], "utf-8") if line >= 0 else None
+                            line += 1
+                        if (
+                            line > 0
+                            and startswith(b"data: ", line)
+                            and find(b"\n", line, end) < 0
+                        ):
+                            frames.append((event or "message", str(view[line + 6 : end], "utf-8")))
+                            event = None
+                            pos = scan = frame_start = end + 2
+                            continue
+                        event = None
+                newline = find(b"\n", scan)
+                if newline < 0:
+                    scan = len(buf)
+                    break
+                start, end = pos, newline
+                if end > start and buf[end - 1] == 0x0D:
+                    end -= 1
+                pos = scan = newline + 1
+                if end == start:
+                    # Blank line dispatches the frame
+                    if data:
+                        frames.append((event or "message", self._join(view, data)))
+                    event = None
+                    data = []
+                    frame_start = pos
+                    continue
+                if buf[start] == 0x3A:
+                    # Comment line, e.g. a `: ping` keep-alive
+                    continue
+                colon = find(b":", start, end)
+                if colon < 0:
+                    colon = value = end
+                else:
+                    value = colon + 1
+                    if value < end and buf[value] == 0x20:
+                        value += 1
+                name_length = colon - start
+                if name_length == 4 and startswith(b"data", start):
+                    data.append((value, end))
+                elif name_length == 5 and startswith(b"event", start):
+                    event = str(view[value:end], "utf-8")
+                elif name_length == 2 and startswith(b"id", start):
+                    self.last_event_id = str(view[value:end], "utf-8")
+        if frame_start:
+            # Drop dispatched frames, keeping offsets into the partial one valid
+            del buf[:frame_start]
+            pos -= frame_start
+            scan -= frame_start
+            data = [(s - frame_start, e - frame_start) for s, e in data]
+        self._pos, self._scan, self._event, self._data = pos, scan, event, data
+        return frames
+
+    @staticmethod
+    def _join(view: memoryview, data: List[Tuple[int, int]]) -> str:
+        if len(data) == 1:
+            start, end = data[0]
+            return str(view[start:end], "utf-8")
+        return str(b"\n".join([view[s:e] for s, e in data]), "utf-8")
+
+
+def iter_sse(chunks: Iterable[bytes]) -> Iterator[SSEFrame]:
+    """Yields the frames decoded from an iterable of raw byte chunks.
+
+    An incomplete frame at the end of the stream is discarded.
+    """
+    decoder = SSEDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+
+
+async def aiter_sse(chunks: AsyncIterable[bytes]) -> AsyncIterator[SSEFrame]:
+    """Async counterpart of `iter_sse`."""
+    decoder = SSEDecoder()
+    async for chunk in chunks:
+        for frame in decoder.feed(chunk):
+            yield frame